@@ -0,0 +1,31 @@
+#!/bin/bash
+#
+# Run a command in a long running Checkmk container outside of VSCode.
+# The site is created once, later calls only exec into the container:
+#
+#   .devcontainer/run.sh python3 -m pytest
+#   .devcontainer/run.sh python3 test/benchmark/agent_based/bench_dell_eql.py --sizes 1000
+
+VARIANT=${VARIANT:-2.2.0-latest}
+CONTAINER=${CONTAINER:-checkmk_dell_eql}
+WORKSPACE=$(cd "$(dirname "$0")/.." && pwd)
+
+if [ -z "$(docker ps -q -f "name=^${CONTAINER}$")" ]; then
+    docker rm -f "$CONTAINER" >/dev/null 2>&1
+    docker build -q -t "$CONTAINER:$VARIANT" --build-arg "VARIANT=$VARIANT" "$WORKSPACE/.devcontainer" >/dev/null || exit 1
+    docker run -d --name "$CONTAINER" \
+        -v "$WORKSPACE:/workspace" \
+        -e OMD_ROOT=/omd/sites/cmk \
+        -e OMD_SITE=cmk \
+        -e CMK_SITE_ID=cmk \
+        -e WORKSPACE=/workspace \
+        "$CONTAINER:$VARIANT" -c '/workspace/.devcontainer/symlink.sh >/dev/null && exec sleep infinity' >/dev/null || exit 1
+
+    until docker exec "$CONTAINER" test -L /omd/sites/cmk/local/lib/check_mk/base/plugins/agent_based; do
+        sleep 1
+    done
+fi
+
+exec docker exec -i -w /workspace -u cmk \
+    -e PATH=/omd/sites/cmk/bin:/usr/local/bin:/usr/bin:/bin \
+    "$CONTAINER" "$@"
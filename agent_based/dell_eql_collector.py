@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Example output from the special agent
+# <<<dell_eql_collector:sep(9)>>>
+# disk	0.412	24	2	3480	0
+# volume_stats	12.930	20000	4812	2985214	1
+# temperature	5.005	0	2	0	2	Timeout after 3 attempts on 1.3.6.1.4.1.12740.2.1.6.1.2
+
+
+from typing import NamedTuple
+from .agent_based_api.v1 import (
+    check_levels,
+    register,
+    render,
+    Result,
+    Service,
+    State,
+)
+from .dell_eql_utils import profiled
+
+
+class EqlTableStats(NamedTuple):
+    duration: float
+    rows: int
+    requests: int
+    bytes: int
+    timeouts: int
+    error: str
+
+
+@profiled
+def parse_dell_eql_collector(string_table):
+    parsed = {}
+
+    for name, duration, rows, requests, size, timeouts, *error in string_table:
+        parsed[name] = EqlTableStats(
+            duration=float(duration),
+            rows=int(rows),
+            requests=int(requests),
+            bytes=int(size),
+            timeouts=int(timeouts),
+            error=' '.join(error),
+        )
+    return parsed
+
+
+register.agent_section(
+    name='dell_eql_collector',
+    parse_function=parse_dell_eql_collector,
+)
+
+
+@profiled
+def discovery_dell_eql_collector(section):
+    for name in section:
+        yield Service(item=name)
+
+
+@profiled
+def check_dell_eql_collector(item, params, section):
+    stats = section.get(item)
+    if stats is None:
+        return
+
+    if stats.error:
+        yield Result(state=State.WARN, summary=f'Walk failed: {stats.error}')
+
+    yield from check_levels(
+        value=stats.duration,
+        levels_upper=params.get('duration'),
+        metric_name='dell_eql_collector_duration',
+        render_func=render.timespan,
+        label='Duration',
+    )
+    yield from check_levels(
+        value=stats.rows,
+        metric_name='dell_eql_collector_rows',
+        render_func=lambda v: '%d' % v,
+        label='Rows',
+    )
+    yield from check_levels(
+        value=stats.requests,
+        metric_name='dell_eql_collector_requests',
+        render_func=lambda v: '%d' % v,
+        label='Requests',
+        notice_only=True,
+    )
+    yield from check_levels(
+        value=stats.bytes,
+        levels_upper=params.get('bytes'),
+        metric_name='dell_eql_collector_bytes',
+        render_func=render.bytes,
+        label='Received',
+    )
+    yield from check_levels(
+        value=stats.timeouts,
+        levels_upper=params.get('timeouts'),
+        metric_name='dell_eql_collector_timeouts',
+        render_func=lambda v: '%d' % v,
+        label='Timeouts',
+        notice_only=True,
+    )
+
+
+register.check_plugin(
+    name='dell_eql_collector',
+    service_name='EQL Collector %s',
+    discovery_function=discovery_dell_eql_collector,
+    check_function=check_dell_eql_collector,
+    check_ruleset_name='dell_eql_collector',
+    check_default_parameters={},
+)
@@ -19,7 +19,6 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 # Example excerpt from SNMP data
-# .1.3.6.1.4.1.12740.2.1.1.1.9.1.1715262484 MEMBER1 --> EQLMEMBER-MIB::eqlMemberName
 # .1.3.6.1.4.1.12740.3.1.1.1.8.1.1715262484.6 1 --> EQLDISK-MIB::eqlDiskStatus
 # .1.3.6.1.4.1.12740.3.1.1.1.11.1.1715262484.6 5 --> EQLDISK-MIB::eqlDiskSlot
 # .1.3.6.1.4.1.12740.3.1.1.1.17.1.1715262484.6 1 --> EQLDISK-MIB::eqlDiskHealth
@@ -28,12 +27,9 @@
 
 
 import time
-from contextlib import suppress
 from .agent_based_api.v1 import (
     exists,
-    get_rate,
     get_value_store,
-    GetRateError,
     OIDEnd,
     register,
     Result,
@@ -42,24 +38,23 @@ from .agent_based_api.v1 import (
     State,
 )
 from .utils import diskstat
+from .dell_eql_utils import (
+    drop_legacy_rates,
+    get_rates,
+    profiled,
+)
 
 
+@profiled
 def parse_dell_eql_disk(string_table):
-    members, disks = string_table
-    membername = dict(members)
-
     parsed = {}
 
-    for idx, status, slot, smart, read_throughput, write_throughput in disks:
+    for idx, status, slot, smart in string_table:
         member, midx = idx.rsplit('.', 1)
-        name = f'{membername.get(member)}.{midx}'
-
-        parsed[name] = {
+        parsed.setdefault(member, {})[midx] = {
             'status': int(status),
             'slot': int(slot),
             'smart': int(smart),
-            'read_throughput': int(read_throughput),
-            'write_throughput': int(write_throughput),
         }
 
     return parsed
@@ -68,29 +63,72 @@ def parse_dell_eql_disk(string_table):
 register.snmp_section(
     name='dell_eql_disk',
     detect=exists('.1.3.6.1.4.1.12740.3.1.*'),
-    fetch=[
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.2.1.1.1',
-            oids=[
-                OIDEnd(),
-                '9',  # EQLMEMBER-MIB::eqlMemberName
-            ]
-        ),
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.3.1',
-            oids=[
-                OIDEnd(),
-                '1.1.8',   # EQLDISK-MIB::eqlDiskStatus
-                '1.1.11',  # EQLDISK-MIB::eqlDiskSlot
-                '1.1.17',   # EQLDISK-MIB::eqlDiskHealth
-                '2.1.2',   # EQLDISK-MIB::eqlDiskStatusBytesRead
-                '2.1.3',   # EQLDISK-MIB::eqlDiskStatusBytesWritten
-            ],
-        ),
-    ],
+    fetch=SNMPTree(
+        base='.1.3.6.1.4.1.12740.3.1.1.1',
+        oids=[
+            OIDEnd(),
+            '8',   # EQLDISK-MIB::eqlDiskStatus
+            '11',  # EQLDISK-MIB::eqlDiskSlot
+            '17',  # EQLDISK-MIB::eqlDiskHealth
+        ],
+    ),
     parse_function=parse_dell_eql_disk,
 )
 
+
+register.agent_section(
+    name='dell_eql_bulk_disk',
+    parsed_section_name='dell_eql_disk',
+    parse_function=parse_dell_eql_disk,
+)
+
+
+@profiled
+def parse_dell_eql_disk_stats(string_table):
+    parsed = {}
+
+    for idx, read_throughput, write_throughput in string_table:
+        member, midx = idx.rsplit('.', 1)
+
+        if member not in parsed:
+            parsed[member] = {
+                'disks': {},
+                'read_throughput': 0,
+                'write_throughput': 0,
+            }
+
+        disk = {
+            'read_throughput': int(read_throughput),
+            'write_throughput': int(write_throughput),
+        }
+        parsed[member]['disks'][midx] = disk
+        parsed[member]['read_throughput'] += disk['read_throughput']
+        parsed[member]['write_throughput'] += disk['write_throughput']
+
+    return parsed
+
+
+register.snmp_section(
+    name='dell_eql_disk_stats',
+    detect=exists('.1.3.6.1.4.1.12740.3.1.*'),
+    fetch=SNMPTree(
+        base='.1.3.6.1.4.1.12740.3.1.2.1',
+        oids=[
+            OIDEnd(),
+            '2',   # EQLDISK-MIB::eqlDiskStatusBytesRead
+            '3',   # EQLDISK-MIB::eqlDiskStatusBytesWritten
+        ],
+    ),
+    parse_function=parse_dell_eql_disk_stats,
+)
+
+
+register.agent_section(
+    name='dell_eql_bulk_disk_stats',
+    parsed_section_name='dell_eql_disk_stats',
+    parse_function=parse_dell_eql_disk_stats,
+)
+
 DELL_EQL_DISK_STATUS = {
     1: (State.OK, 'on-line'),
     2: (State.OK, 'spare'),
@@ -113,13 +151,20 @@ DELL_EQL_DISK_SMART_STATUS = {
 }
 
 
-def discovery_dell_eql_disk(params, section):
-    if 'summary' in params[0]:
-        for member in set([disk.rsplit('.', 1)[0] for disk in section.keys()]):
+@profiled
+def discovery_dell_eql_disk(params, section_dell_eql_disk, section_dell_eql_disk_stats, section_dell_eql_member_name):
+    if section_dell_eql_disk is None or section_dell_eql_member_name is None:
+        return
+
+    for member, member_idx in section_dell_eql_member_name.items():
+        if member_idx not in section_dell_eql_disk:
+            continue
+
+        if 'summary' in params[0]:
             yield Service(item=f'SUMMARY {member}')
-    else:
-        for disk in section.keys():
-            yield Service(item=f'{disk}')
+        else:
+            for midx in section_dell_eql_disk[member_idx]:
+                yield Service(item=f'{member}.{midx}')
 
 
 def check_dell_eql_single_disk(name, disk):
@@ -131,59 +176,51 @@ def check_dell_eql_single_disk(name, disk):
         notice=f'{name} Slot: {disk["slot"]} Status: {admin_str} SMART: {smart_str}')
 
 
-def check_dell_eql_disk(item, params, section):
-    stat = {
-        'read_throughput': 0,
-        'write_throughput': 0
-    }
-    found = False
+@profiled
+def check_dell_eql_disk(item, params, section_dell_eql_disk, section_dell_eql_disk_stats, section_dell_eql_member_name):
+    if section_dell_eql_disk is None or section_dell_eql_member_name is None:
+        return
 
     if item.startswith('SUMMARY '):
-        for name, value in section.items():
-            if not name.startswith(item[8:]):
-                continue
-
-            yield from check_dell_eql_single_disk(name, value)
-
-            stat['read_throughput'] += value['read_throughput']
-            stat['write_throughput'] += value['write_throughput']
-
-            found = True
+        member = item[8:]
+        member_idx = section_dell_eql_member_name.get(member)
+        disks = section_dell_eql_disk.get(member_idx)
+        if disks is None:
+            return
+        stat = (section_dell_eql_disk_stats or {}).get(member_idx)
 
     else:
-        for name, value in section.items():
-            if not name == item:
-                continue
-
-            yield from check_dell_eql_single_disk(name, value)
-
-            stat['read_throughput'] = value['read_throughput']
-            stat['write_throughput'] = value['write_throughput']
-
-            found = True
-
-    if not found:
+        member, _, midx = item.rpartition('.')
+        member_idx = section_dell_eql_member_name.get(member)
+        disks = section_dell_eql_disk.get(member_idx, {})
+        if midx not in disks:
+            return
+        disks = {midx: disks[midx]}
+        stat = (section_dell_eql_disk_stats or {}).get(member_idx, {'disks': {}})['disks'].get(midx)
+
+    for midx, disk in disks.items():
+        yield from check_dell_eql_single_disk(f'{member}.{midx}', disk)
+
+    if stat is None:
         return
 
+    now = time.time()
     value_store = get_value_store()
-    for key in ['read_throughput', 'write_throughput']:
-        with suppress(GetRateError):
-            stat[key] = get_rate(value_store,
-                                 'dell_eql_disk.%s.%s' % (item, key),
-                                 time.time(),
-                                 stat[key])
+    drop_legacy_rates(value_store, 'dell_eql_disk', (f'dell_eql_disk.{item}.{key}' for key in ('read_throughput', 'write_throughput')))
+    rates = get_rates(value_store, 'dell_eql_disk', now, (stat['read_throughput'], stat['write_throughput']))
 
     yield from diskstat.check_diskstat_dict(
         params=params,
-        disk=stat,
+        disk=dict(zip(('read_throughput', 'write_throughput'), rates)) if rates else {},
         value_store=value_store,
-        this_time=time.time(),
+        this_time=now,
     )
 
 
 register.check_plugin(
     name='dell_eql_disk',
     service_name='Disk IO %s',
+    sections=['dell_eql_disk', 'dell_eql_disk_stats', 'dell_eql_member_name'],
     discovery_ruleset_name="diskstat_inventory",
     discovery_ruleset_type=register.RuleSetType.ALL,
     discovery_default_parameters={'summary': True},
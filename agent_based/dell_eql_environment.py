@@ -0,0 +1,201 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+# Example excerpt from SNMP data
+# .1.3.6.1.4.1.12740.2.1.6.1.2.1.1234567890.2 Backplane sensor 0 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureName
+# .1.3.6.1.4.1.12740.2.1.6.1.3.1.1234567890.2 29 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureValue
+# .1.3.6.1.4.1.12740.2.1.6.1.4.1.1234567890.2 1 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureCurrentState
+# .1.3.6.1.4.1.12740.2.1.6.1.5.1.1234567890.2 50 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureHighCriticalThreshold
+# .1.3.6.1.4.1.12740.2.1.6.1.6.1.1234567890.2 45 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureHighWarningThreshold
+# .1.3.6.1.4.1.12740.2.1.6.1.7.1.1234567890.2 1 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureLowCriticalThreshold
+# .1.3.6.1.4.1.12740.2.1.6.1.8.1.1234567890.2 2 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureLowWarningThreshold
+# .1.3.6.1.4.1.12740.2.1.7.1.2.1.1234567890.1 Power Cooling Module 0 Fan 0 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanName
+# .1.3.6.1.4.1.12740.2.1.7.1.3.1.1234567890.1 6000 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanValue
+# .1.3.6.1.4.1.12740.2.1.7.1.4.1.1234567890.1 1 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanCurrentState
+# .1.3.6.1.4.1.12740.2.1.7.1.5.1.1234567890.1 14000 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanHighCriticalThreshold
+# .1.3.6.1.4.1.12740.2.1.7.1.6.1.1234567890.1 13500 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanHighWarningThreshold
+# .1.3.6.1.4.1.12740.2.1.7.1.7.1.1234567890.1 3000 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanLowCriticalThreshold
+# .1.3.6.1.4.1.12740.2.1.7.1.8.1.1234567890.1 3500 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanLowWarningThreshold
+
+
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+from .agent_based_api.v1 import (
+    any_of,
+    exists,
+    OIDEnd,
+    register,
+    SNMPTree,
+    State,
+)
+from .dell_eql_utils import (
+    profiled,
+    split_tables,
+)
+
+
+class EqlSensor(NamedTuple):
+    name: str
+    value: int
+    state: int
+    levels_lower: Tuple[int, int]
+    levels_upper: Tuple[int, int]
+
+
+class EqlEnvironment(NamedTuple):
+    temperatures: Dict[str, Dict[str, EqlSensor]]
+    fans: Dict[str, Dict[str, EqlSensor]]
+
+
+class EqlSensorSummary(NamedTuple):
+    state: State
+    count: int
+    minimum: int
+    maximum: int
+    average: float
+    offending: List[Tuple[str, int, State]]
+
+
+def levels_state(value: float, levels_upper: Optional[Tuple[float, float]], levels_lower: Optional[Tuple[float, float]]) -> State:
+    if levels_upper and value >= levels_upper[1]:
+        return State.CRIT
+    if levels_lower and value < levels_lower[1]:
+        return State.CRIT
+    if levels_upper and value >= levels_upper[0]:
+        return State.WARN
+    if levels_lower and value < levels_lower[0]:
+        return State.WARN
+    return State.OK
+
+
+def summarize_sensors(sensors: Mapping[str, EqlSensor],
+                      levels_upper: Optional[Tuple[float, float]] = None,
+                      levels_lower: Optional[Tuple[float, float]] = None) -> Optional[EqlSensorSummary]:
+    """Summarize the sensors of a member in one pass
+
+    The state of a sensor is the worst of its own state and of its reading
+    against the given levels, or the levels of the device if none are
+    given. Sensors which are not OK are returned as offending.
+    """
+    if not sensors:
+        return None
+
+    state = State.OK
+    minimum = maximum = None
+    total = 0
+    offending = []
+    for sensor in sensors.values():
+        sensor_state = State.worst(sensor.state, levels_state(
+            sensor.value,
+            sensor.levels_upper if levels_upper is None else levels_upper,
+            sensor.levels_lower if levels_lower is None else levels_lower,
+        ))
+        if sensor_state is not State.OK:
+            state = State.worst(state, sensor_state)
+            offending.append((sensor.name, sensor.value, sensor_state))
+        if minimum is None or sensor.value < minimum:
+            minimum = sensor.value
+        if maximum is None or sensor.value > maximum:
+            maximum = sensor.value
+        total += sensor.value
+
+    return EqlSensorSummary(
+        state=state,
+        count=len(sensors),
+        minimum=minimum,
+        maximum=maximum,
+        average=total / len(sensors),
+        offending=offending,
+    )
+
+
+def parse_dell_eql_sensors(string_table):
+    parsed = {}
+
+    for idx, name, value, state, upper_crit, upper_warn, lower_crit, lower_warn in string_table:
+        member, midx = idx.rsplit('.', 1)
+        parsed.setdefault(member, {})[midx] = EqlSensor(
+            name=name,
+            value=int(value),
+            state=State((int(state) - 1) % 4),
+            levels_lower=(int(lower_warn), int(lower_crit)),
+            levels_upper=(int(upper_warn), int(upper_crit)),
+        )
+    return parsed
+
+
+@profiled
+def parse_dell_eql_environment(string_table):
+    temperatures, fans = string_table
+
+    return EqlEnvironment(
+        temperatures=parse_dell_eql_sensors(temperatures),
+        fans=parse_dell_eql_sensors(fans),
+    )
+
+
+register.snmp_section(
+    name='dell_eql_environment',
+    detect=any_of(
+        exists('.1.3.6.1.4.1.12740.2.1.6.1.*'),
+        exists('.1.3.6.1.4.1.12740.2.1.7.1.*'),
+    ),
+    fetch=[
+        SNMPTree(
+            base='.1.3.6.1.4.1.12740.2.1.6.1',
+            oids=[
+                OIDEnd(),
+                '2',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureName
+                '3',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureValue
+                '4',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureCurrentState
+                '5',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureHighCriticalThreshold
+                '6',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureHighWarningThreshold
+                '7',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureLowCriticalThreshold
+                '8',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureLowWarningThreshold
+            ],
+        ),
+        SNMPTree(
+            base='.1.3.6.1.4.1.12740.2.1.7.1',
+            oids=[
+                OIDEnd(),
+                '2',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanName
+                '3',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanValue
+                '4',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanCurrentState
+                '5',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanHighCriticalThreshold
+                '6',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanHighWarningThreshold
+                '7',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanLowCriticalThreshold
+                '8',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanLowWarningThreshold
+            ],
+        ),
+    ],
+    parse_function=parse_dell_eql_environment,
+)
+
+
+@profiled
+def parse_dell_eql_bulk_environment(string_table):
+    return parse_dell_eql_environment(split_tables(string_table, 2))
+
+
+register.agent_section(
+    name='dell_eql_bulk_environment',
+    parsed_section_name='dell_eql_environment',
+    parse_function=parse_dell_eql_bulk_environment,
+)
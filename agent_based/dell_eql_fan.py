@@ -19,7 +19,6 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 # Example excerpt from SNMP data
-# .1.3.6.1.4.1.12740.2.1.1.1.9.1.1234567890 MEMBER1 --> EQLMEMBER-MIB::eqlMemberName
 # .1.3.6.1.4.1.12740.2.1.7.1.2.1.1234567890.1 Power Cooling Module 0 Fan 0 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanName
 # .1.3.6.1.4.1.12740.2.1.7.1.3.1.1234567890.1 6000 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanValue
 # .1.3.6.1.4.1.12740.2.1.7.1.4.1.1234567890.1 1 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanCurrentState
@@ -30,102 +29,90 @@
 # .1.3.6.1.4.1.12740.2.1.7.1.9.1.1234567890.1 117964884 --> EQLMEMBER-MIB::eqlMemberHealthDetailsFanNameID
 
 
-from typing import NamedTuple, Tuple
 from .agent_based_api.v1 import (
     check_levels,
-    exists,
-    OIDEnd,
+    Metric,
     register,
     Result,
     Service,
-    SNMPTree,
     State,
 )
+from .dell_eql_environment import summarize_sensors
+from .dell_eql_utils import profiled
 
 
-class EqlFan(NamedTuple):
-    item: str
-    name: str
-    value: int
-    state: int
-    levels_lower: Tuple[int, int]
-    levels_upper: Tuple[int, int]
-
-
-def parse_dell_eql_fan(string_table):
-    parsed = []
-
-    members, temps = string_table
-    membername = dict(members)
-
-    for idx, name, value, state, upper_crit, upper_warn, lower_crit, lower_warn in temps:
-        member, midx = idx.rsplit('.', 1)
-        parsed.append(
-            EqlFan(
-                item=f'{membername.get(member)}.{midx}',
-                name=name,
-                value=int(value),
-                state=State((int(state) - 1) % 4),
-                levels_lower=(int(lower_warn), int(lower_crit)),
-                levels_upper=(int(upper_warn), int(upper_crit)),
-            )
-        )
-    return parsed
+@profiled
+def discovery_dell_eql_fan(params, section_dell_eql_environment, section_dell_eql_member_name):
+    if section_dell_eql_environment is None or section_dell_eql_member_name is None:
+        return
 
+    for member, member_idx in section_dell_eql_member_name.items():
+        fans = section_dell_eql_environment.fans.get(member_idx)
+        if not fans:
+            continue
 
-register.snmp_section(
-    name='dell_eql_fan',
-    detect=exists('.1.3.6.1.4.1.12740.2.1.7.1.*'),
-    fetch=[
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.2.1.1.1',
-            oids=[
-                OIDEnd(),
-                '9',  # EQLMEMBER-MIB::eqlMemberName
-            ]
-        ),
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.2.1.7.1',
-            oids=[
-                OIDEnd(),
-                '2',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureName
-                '3',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanValue
-                '4',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanCurrentState
-                '5',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanHighCriticalThreshold
-                '6',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanHighWarningThreshold
-                '7',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanLowCriticalThreshold
-                '8',  # EQLMEMBER-MIB::eqlMemberHealthDetailsFanLowWarningThreshold
-            ],
-        ),
-    ],
-    parse_function=parse_dell_eql_fan,
-)
+        if 'summary' in params[0]:
+            yield Service(item=f'SUMMARY {member}')
+        else:
+            for midx in fans:
+                yield Service(item=f'{member}.{midx}')
+
+
+def check_dell_eql_fan_summary(member, params, section_dell_eql_environment, section_dell_eql_member_name):
+    summary = summarize_sensors(
+        section_dell_eql_environment.fans.get(section_dell_eql_member_name.get(member), {}),
+        levels_upper=params.get('upper'),
+        levels_lower=params.get('lower'),
+    )
+    if summary is None:
+        return
+
+    yield Result(state=State.OK, summary=f'Fans: {summary.count}')
+    yield Result(
+        state=State.OK,
+        summary=f'Min: {summary.minimum:.2f}, Max: {summary.maximum:.2f}, Average: {summary.average:.2f}',
+    )
+    if summary.offending:
+        yield Result(
+            state=summary.state,
+            summary='Not OK: ' + ', '.join(f'{name} ({value:.2f})' for name, value, _state in summary.offending),
+        )
+    if params.get('output_metrics', True):
+        yield Metric('fan', summary.average)
 
 
-def discovery_dell_eql_fan(section):
-    for fan in section:
-        yield Service(item=fan.item)
+@profiled
+def check_dell_eql_fan(item, params, section_dell_eql_environment, section_dell_eql_member_name):
+    if section_dell_eql_environment is None or section_dell_eql_member_name is None:
+        return
 
+    if item.startswith('SUMMARY '):
+        yield from check_dell_eql_fan_summary(item[8:], params, section_dell_eql_environment, section_dell_eql_member_name)
+        return
 
-def check_dell_eql_fan(item, params, section):
-    for fan in section:
-        if not item == fan.item:
-            continue
+    member, _, midx = item.rpartition('.')
+    fan = section_dell_eql_environment.fans.get(section_dell_eql_member_name.get(member), {}).get(midx)
+    if fan is None:
+        return
 
-        yield Result(state=fan.state, summary=fan.name)
+    yield Result(state=fan.state, summary=fan.name)
 
-        yield from check_levels(
-            value=fan.value,
-            metric_name='fan' if params.get('output_metrics', True) else None,
-            levels_lower=params.get('lower', fan.levels_lower),
-            levels_upper=params.get('upper', fan.levels_upper),
-            label='Fan Speed',
-        )
+    yield from check_levels(
+        value=fan.value,
+        metric_name='fan' if params.get('output_metrics', True) else None,
+        levels_lower=params.get('lower', fan.levels_lower),
+        levels_upper=params.get('upper', fan.levels_upper),
+        label='Fan Speed',
+    )
 
 
 register.check_plugin(
     name='dell_eql_fan',
+    sections=['dell_eql_environment', 'dell_eql_member_name'],
     service_name='FAN %s',
+    discovery_ruleset_name='dell_eql_fan_discovery',
+    discovery_ruleset_type=register.RuleSetType.ALL,
+    discovery_default_parameters={},
     discovery_function=discovery_dell_eql_fan,
     check_function=check_dell_eql_fan,
     check_ruleset_name='hw_fans',
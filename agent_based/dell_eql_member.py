@@ -20,6 +20,8 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 # Example excerpt from SNMP data
+# .1.3.6.1.4.1.12740.2.1.1.1.9.1.1234567890 MEMBER1 --> EQLMEMBER-MIB::eqlMemberName
+# .1.3.6.1.4.1.12740.2.1.1.1.9.1.1234567891 MEMBER2 --> EQLMEMBER-MIB::eqlMemberName
 # .1.3.6.1.4.1.12740.2.1.5.1.1.1.1234567890 2 --> EQLMEMBER-MIB::eqlMemberHealthStatus
 # .1.3.6.1.4.1.12740.2.1.5.1.1.1.1234567891 1 --> EQLMEMBER-MIB::eqlMemberHealthStatus
 # .1.3.6.1.4.1.12740.2.1.5.1.2.1.1234567890 '00 00 00 01 00 00 00 00 00 00 00 00 00 00 00 00 ' --> EQLMEMBER-MIB::eqlMemberHealthWarningConditions
@@ -29,11 +31,12 @@
 
 
 from typing import NamedTuple
-from functools import reduce
+from functools import lru_cache
 from .agent_based_api.v1 import (
     exists,
     Metric,
     OIDBytes,
+    OIDEnd,
     register,
     render,
     Result,
@@ -41,6 +44,7 @@ from .agent_based_api.v1 import (
     SNMPTree,
     State,
 )
+from .dell_eql_utils import profiled
 
 
 class EqlMember(NamedTuple):
@@ -128,30 +132,45 @@ DELL_EQL_CRITICAL_CONDITIONS = (
 )
 
 
+# Bit numbers set in each possible byte value, most significant bit first
+DELL_EQL_BYTE_BITS = tuple(
+    tuple(bit for bit in range(8) if value & (0x80 >> bit))
+    for value in range(256)
+)
+
+
 def byte_to_index(bytelist):
-    bitindex = reduce(lambda a, b: (a << 8) + b, bytelist)
-    if bitindex == 0:
-        return []
-    return filter(lambda i: 1 << (31 - i) & bitindex, range(32))
+    return [
+        offset * 8 + bit
+        for offset, byte in enumerate(bytelist) if byte
+        for bit in DELL_EQL_BYTE_BITS[byte]
+    ]
+
 
+@lru_cache(maxsize=128)
+def decode_conditions(bytelist, conditions):
+    return tuple(
+        conditions[idx] if idx < len(conditions) else f'unknown({idx})'
+        for idx in byte_to_index(bytelist)
+    )
 
+
+@profiled
 def parse_dell_eql_member(string_table):
-    parsed = []
+    parsed = {}
 
     for name, desc, health, warnings, critical, raid, storage, repl, snap, used in string_table:
-        parsed.append(
-            EqlMember(
-                name=name,
-                desc=desc,
-                health=State((int(health) - 1) % 4),
-                warnings=[DELL_EQL_WARNING_CONDITIONS[idx] for idx in byte_to_index(warnings[:4])],
-                critical=[DELL_EQL_CRITICAL_CONDITIONS[idx] for idx in byte_to_index(critical[:4])],
-                raid=int(raid),
-                storage=int(storage) * 1024 * 1024,
-                repl=int(repl) * 1024 * 1024,
-                snap=int(snap) * 1024 * 1024,
-                used=int(used) * 1024 * 1024,
-            )
+        parsed[name] = EqlMember(
+            name=name,
+            desc=desc,
+            health=State((int(health) - 1) % 4),
+            warnings=list(decode_conditions(tuple(warnings), DELL_EQL_WARNING_CONDITIONS)),
+            critical=list(decode_conditions(tuple(critical), DELL_EQL_CRITICAL_CONDITIONS)),
+            raid=int(raid),
+            storage=int(storage) * 1024 * 1024,
+            repl=int(repl) * 1024 * 1024,
+            snap=int(snap) * 1024 * 1024,
+            used=int(used) * 1024 * 1024,
         )
     return parsed
 
@@ -179,6 +198,47 @@ register.snmp_section(
 )
 
 
+@profiled
+def parse_dell_eql_bulk_member(string_table):
+    return parse_dell_eql_member([
+        row[:3] + [list(bytes.fromhex(row[3])), list(bytes.fromhex(row[4]))] + row[5:]
+        for row in string_table
+    ])
+
+
+register.agent_section(
+    name='dell_eql_bulk_member',
+    parsed_section_name='dell_eql_member',
+    parse_function=parse_dell_eql_bulk_member,
+)
+
+
+@profiled
+def parse_dell_eql_member_name(string_table):
+    return {name: idx for idx, name in string_table}
+
+
+register.snmp_section(
+    name='dell_eql_member_name',
+    detect=exists('.1.3.6.1.4.1.12740.2.1.1.1.9.1.*'),
+    fetch=SNMPTree(
+        base='.1.3.6.1.4.1.12740.2.1.1.1',
+        oids=[
+            OIDEnd(),
+            '9',  # EQLMEMBER-MIB::eqlMemberName
+        ],
+    ),
+    parse_function=parse_dell_eql_member_name,
+)
+
+
+register.agent_section(
+    name='dell_eql_bulk_member_name',
+    parsed_section_name='dell_eql_member_name',
+    parse_function=parse_dell_eql_member_name,
+)
+
+
 DELL_EQL_RAID_STATES = {
     1: 'Ok',
     2: 'Degraded',
@@ -191,42 +251,44 @@ DELL_EQL_RAID_STATES = {
 }
 
 
+@profiled
 def discovery_dell_eql_member(section):
-    for member in section:
+    for member in section.values():
         yield Service(item=member.name)
 
 
+@profiled
 def check_dell_eql_member(item, section):
-    for member in section:
-        if not item == member.name:
-            continue
-
-        if member.desc:
-            yield Result(state=State.OK, summary=member.desc)
-
-        # Health
-        yield Result(state=member.health, notice=f'Health State: {member.health}')
-        if member.warnings:
-            yield Result(state=State.WARN, summary=f'Warn: {" ".join(member.warnings)}')
-        if member.critical:
-            yield Result(state=State.CRIT, summary=f'Crit: {" ".join(member.critical)}')
-
-        # RAID
-        if member.raid == 1:
-            state = State.OK
-        elif member.raid in [3, 4, 7, 8]:
-            state = State.WARN
-        else:
-            state = State.CRIT
-        yield Result(state=state, notice=f'Raid State: {DELL_EQL_RAID_STATES[member.raid]}')
-
-        yield Result(state=State.OK, summary='Used: %s/%s (Snapshots: %s, Replication: %s)' % (
-            render.disksize(member.used), render.disksize(member.storage),
-            render.disksize(member.snap), render.disksize(member.repl),
-        ))
-
-        yield Metric('fs_used', member.used)
-        yield Metric('fs_size', member.storage)
+    member = section.get(item)
+    if member is None:
+        return
+
+    if member.desc:
+        yield Result(state=State.OK, summary=member.desc)
+
+    # Health
+    yield Result(state=member.health, notice=f'Health State: {member.health}')
+    if member.warnings:
+        yield Result(state=State.WARN, summary=f'Warn: {" ".join(member.warnings)}')
+    if member.critical:
+        yield Result(state=State.CRIT, summary=f'Crit: {" ".join(member.critical)}')
+
+    # RAID
+    if member.raid == 1:
+        state = State.OK
+    elif member.raid in [3, 4, 7, 8]:
+        state = State.WARN
+    else:
+        state = State.CRIT
+    yield Result(state=state, notice=f'Raid State: {DELL_EQL_RAID_STATES[member.raid]}')
+
+    yield Result(state=State.OK, summary='Used: %s/%s (Snapshots: %s, Replication: %s)' % (
+        render.disksize(member.used), render.disksize(member.storage),
+        render.disksize(member.snap), render.disksize(member.repl),
+    ))
+
+    yield Metric('fs_used', member.used)
+    yield Metric('fs_size', member.storage)
 
 
 register.check_plugin(
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# The pools are the EQLSTORAGEPOOL-MIB::eqlStoragePoolName resolved by
+# the dell_eql_volume section, the counters those of dell_eql_volume_stats.
+
+
+from typing import Any, Dict, List, NamedTuple, Optional
+import time
+from .agent_based_api.v1 import (
+    get_value_store,
+    register,
+    Result,
+    Service,
+    State,
+)
+from .utils import diskstat
+from .dell_eql_utils import (
+    get_total_rates,
+    profiled,
+)
+from .dell_eql_volume import EqlVolumeStats, summed_disk
+
+
+class EqlPool(NamedTuple):
+    volumes: int
+    stats: Optional[EqlVolumeStats]
+    # The indexes of the volumes summed into stats
+    members: List[str]
+
+
+# The pools summed from the last sections. All pool services of a host
+# get the same parsed sections within a check cycle, so the volumes are
+# summed once per cycle and not once per pool.
+_POOL_CACHE: List[Any] = [None, None, {}]
+
+
+def sum_pools(section_dell_eql_volume, section_dell_eql_volume_stats) -> Dict[str, EqlPool]:
+    """Sum the counters of the volumes of every pool without decoding the volumes"""
+    cached_volumes, cached_stats, pools = _POOL_CACHE
+    if cached_volumes is section_dell_eql_volume and cached_stats is section_dell_eql_volume_stats:
+        return pools
+
+    volume_stats = section_dell_eql_volume_stats or {}
+    pools = {}
+    for pool, indexes in section_dell_eql_volume.pool_indexes().items():
+        members = [index for index in indexes if index in volume_stats]
+        pools[pool] = EqlPool(
+            volumes=len(indexes),
+            stats=section_dell_eql_volume_stats.total(members) if members else None,
+            members=members,
+        )
+    _POOL_CACHE[:] = [section_dell_eql_volume, section_dell_eql_volume_stats, pools]
+    return pools
+
+
+@profiled
+def discovery_dell_eql_pool(section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume is None:
+        return
+
+    for pool in sum_pools(section_dell_eql_volume, section_dell_eql_volume_stats):
+        yield Service(item=pool)
+
+
+@profiled
+def check_dell_eql_pool(item, params, section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume is None:
+        return
+
+    pool = sum_pools(section_dell_eql_volume, section_dell_eql_volume_stats).get(item)
+    if pool is None:
+        return
+
+    yield Result(state=State.OK, summary=f'Volumes: {pool.volumes}')
+
+    if pool.stats is None:
+        return
+
+    now = time.time()
+    value_store = get_value_store()
+    rates = get_total_rates(value_store, 'dell_eql_pool', now, pool.stats, pool.members)
+
+    yield from diskstat.check_diskstat_dict(
+        params=params,
+        disk=summed_disk(rates),
+        value_store=value_store,
+        this_time=now,
+    )
+
+
+register.check_plugin(
+    name='dell_eql_pool',
+    sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+    service_name='Pool %s',
+    discovery_function=discovery_dell_eql_pool,
+    check_function=check_dell_eql_pool,
+    check_ruleset_name='diskstat',
+    check_default_parameters={},
+)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# One service per host reporting the parse functions timed with
+# DELL_EQL_PROFILE, see dell_eql_utils.profiled.
+
+
+from .agent_based_api.v1 import (
+    Metric,
+    register,
+    render,
+    Result,
+    Service,
+    State,
+)
+from .dell_eql_utils import (
+    DELL_EQL_PROFILE,
+    parse_record,
+)
+
+DELL_EQL_PROFILE_SECTIONS = [
+    'dell_eql_collector',
+    'dell_eql_disk',
+    'dell_eql_disk_stats',
+    'dell_eql_environment',
+    'dell_eql_member',
+    'dell_eql_member_name',
+    'dell_eql_volume',
+    'dell_eql_volume_stats',
+]
+
+
+def discovery_dell_eql_profile(section_dell_eql_collector, section_dell_eql_disk, section_dell_eql_disk_stats,
+                               section_dell_eql_environment, section_dell_eql_member, section_dell_eql_member_name,
+                               section_dell_eql_volume, section_dell_eql_volume_stats):
+    if DELL_EQL_PROFILE:
+        yield Service()
+
+
+def check_dell_eql_profile(section_dell_eql_collector, section_dell_eql_disk, section_dell_eql_disk_stats,
+                           section_dell_eql_environment, section_dell_eql_member, section_dell_eql_member_name,
+                           section_dell_eql_volume, section_dell_eql_volume_stats):
+    sections = (
+        section_dell_eql_collector, section_dell_eql_disk, section_dell_eql_disk_stats,
+        section_dell_eql_environment, section_dell_eql_member, section_dell_eql_member_name,
+        section_dell_eql_volume, section_dell_eql_volume_stats,
+    )
+    duration = 0.0
+    objects = 0
+    for name, section in zip(DELL_EQL_PROFILE_SECTIONS, sections):
+        record = parse_record(section)
+        if record is None:
+            continue
+        duration += record.duration
+        objects += record.objects
+        yield Result(state=State.OK, notice=f'{name}: {render.timespan(record.duration)}, {record.objects} objects')
+
+    yield Result(state=State.OK, summary=f'Parse time: {render.timespan(duration)}, {objects} objects')
+    yield Metric('dell_eql_parse_time', duration)
+    yield Metric('dell_eql_parse_objects', objects)
+
+
+register.check_plugin(
+    name='dell_eql_profile',
+    sections=DELL_EQL_PROFILE_SECTIONS,
+    service_name='Dell EqualLogic plugin timing',
+    discovery_function=discovery_dell_eql_profile,
+    check_function=check_dell_eql_profile,
+)
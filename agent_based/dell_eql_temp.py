@@ -20,7 +20,6 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 # Example excerpt from SNMP data
-# .1.3.6.1.4.1.12740.2.1.1.1.9.1.1234567890 MEMBER1 --> EQLMEMBER-MIB::eqlMemberName
 # .1.3.6.1.4.1.12740.2.1.6.1.2.1.1234567890.2 Backplane sensor 0 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureName
 # .1.3.6.1.4.1.12740.2.1.6.1.3.1.1234567890.2 29 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureValue
 # .1.3.6.1.4.1.12740.2.1.6.1.4.1.1234567890.2 1 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureCurrentState
@@ -31,107 +30,94 @@
 # .1.3.6.1.4.1.12740.2.1.6.1.9.1.1234567890.2 117964848 --> EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureNameID
 
 
-from typing import NamedTuple, Tuple
 from .agent_based_api.v1 import (
     get_value_store,
-    exists,
-    OIDEnd,
+    Metric,
     register,
     Result,
     Service,
-    SNMPTree,
     State,
 )
 from .utils.temperature import (
     check_temperature,
 )
+from .dell_eql_environment import summarize_sensors
+from .dell_eql_utils import profiled
 
 
-class EqlTemperature(NamedTuple):
-    item: str
-    name: str
-    value: int
-    state: int
-    levels_lower: Tuple[int, int]
-    levels_upper: Tuple[int, int]
-
-
-def parse_dell_eql_temp(string_table):
-    parsed = []
-
-    members, temps = string_table
-    membername = dict(members)
-
-    for idx, name, value, state, upper_crit, upper_warn, lower_crit, lower_warn in temps:
-        member, midx = idx.rsplit('.', 1)
-        parsed.append(
-            EqlTemperature(
-                item=f'{membername.get(member)}.{midx}',
-                name=name,
-                value=int(value),
-                state=State((int(state) - 1) % 4),
-                levels_lower=(int(lower_warn), int(lower_crit)),
-                levels_upper=(int(upper_warn), int(upper_crit)),
-            )
-        )
-    return parsed
+@profiled
+def discovery_dell_eql_temp(params, section_dell_eql_environment, section_dell_eql_member_name):
+    if section_dell_eql_environment is None or section_dell_eql_member_name is None:
+        return
 
+    for member, member_idx in section_dell_eql_member_name.items():
+        temperatures = section_dell_eql_environment.temperatures.get(member_idx)
+        if not temperatures:
+            continue
 
-register.snmp_section(
-    name='dell_eql_temp',
-    detect=exists('.1.3.6.1.4.1.12740.2.1.6.1.*'),
-    fetch=[
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.2.1.1.1',
-            oids=[
-                OIDEnd(),
-                '9',  # EQLMEMBER-MIB::eqlMemberName
-            ]
-        ),
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.2.1.6.1',
-            oids=[
-                OIDEnd(),
-                '2',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureName
-                '3',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureValue
-                '4',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureCurrentState
-                '5',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureHighCriticalThreshold
-                '6',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureHighWarningThreshold
-                '7',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureLowCriticalThreshold
-                '8',  # EQLMEMBER-MIB::eqlMemberHealthDetailsTemperatureLowWarningThreshold
-            ],
-        ),
-    ],
-    parse_function=parse_dell_eql_temp,
-)
+        if 'summary' in params[0]:
+            yield Service(item=f'SUMMARY {member}')
+        else:
+            for midx in temperatures:
+                yield Service(item=f'{member}.{midx}')
+
+
+def check_dell_eql_temp_summary(member, params, section_dell_eql_environment, section_dell_eql_member_name):
+    summary = summarize_sensors(
+        section_dell_eql_environment.temperatures.get(section_dell_eql_member_name.get(member), {}),
+        levels_upper=params.get('levels'),
+        levels_lower=params.get('levels_lower'),
+    )
+    if summary is None:
+        return
+
+    yield Result(state=State.OK, summary=f'Sensors: {summary.count}')
+    yield Result(
+        state=State.OK,
+        summary=f'Min: {summary.minimum:.1f} °C, Max: {summary.maximum:.1f} °C, Average: {summary.average:.1f} °C',
+    )
+    if summary.offending:
+        yield Result(
+            state=summary.state,
+            summary='Not OK: ' + ', '.join(f'{name} ({value:.1f} °C)' for name, value, _state in summary.offending),
+        )
+    yield Metric('temp', summary.maximum)
 
 
-def discovery_dell_eql_temp(section):
-    for temp in section:
-        yield Service(item=temp.item)
+@profiled
+def check_dell_eql_temp(item, params, section_dell_eql_environment, section_dell_eql_member_name):
+    if section_dell_eql_environment is None or section_dell_eql_member_name is None:
+        return
 
+    if item.startswith('SUMMARY '):
+        yield from check_dell_eql_temp_summary(item[8:], params, section_dell_eql_environment, section_dell_eql_member_name)
+        return
 
-def check_dell_eql_temp(item, params, section):
-    for temp in section:
-        if not item == temp.item:
-            continue
+    member, _, midx = item.rpartition('.')
+    temp = section_dell_eql_environment.temperatures.get(section_dell_eql_member_name.get(member), {}).get(midx)
+    if temp is None:
+        return
 
-        yield Result(state=State.OK, summary=temp.name)
+    yield Result(state=State.OK, summary=temp.name)
 
-        yield from check_temperature(
-            reading=temp.value,
-            params=params,
-            unique_name="dell_eql_temp.%s" % item,
-            value_store=get_value_store(),
-            dev_levels= temp.levels_upper,
-            dev_levels_lower = temp.levels_lower,
-            dev_status=temp.state
-        )
+    yield from check_temperature(
+        reading=temp.value,
+        params=params,
+        unique_name="dell_eql_temp.%s" % item,
+        value_store=get_value_store(),
+        dev_levels= temp.levels_upper,
+        dev_levels_lower = temp.levels_lower,
+        dev_status=temp.state
+    )
 
 
 register.check_plugin(
     name='dell_eql_temp',
+    sections=['dell_eql_environment', 'dell_eql_member_name'],
     service_name='Temperature %s',
+    discovery_ruleset_name='dell_eql_temp_discovery',
+    discovery_ruleset_type=register.RuleSetType.ALL,
+    discovery_default_parameters={},
     discovery_function=discovery_dell_eql_temp,
     check_function=check_dell_eql_temp,
     check_ruleset_name='temp',
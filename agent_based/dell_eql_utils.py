@@ -0,0 +1,173 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+# Helpers shared by the Dell EqualLogic plugins
+
+
+from functools import wraps
+import logging
+import os
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from .agent_based_api.v1 import Metric
+
+# Self timing of the plugins, enabled by setting DELL_EQL_PROFILE in the
+# environment of the site (e.g. in etc/environment)
+DELL_EQL_PROFILE = os.environ.get('DELL_EQL_PROFILE', '') not in ('', '0')
+
+
+class ProfileRecord(NamedTuple):
+    duration: float
+    objects: int
+    result: Any
+
+
+# The last record of every profiled parse function by its name
+DELL_EQL_PARSE_PROFILE: Dict[str, ProfileRecord] = {}
+
+LOGGER = logging.getLogger('cmk.base.plugins.agent_based.dell_eql')
+
+
+def get_rates(value_store, key: str, this_time: float, counters: Sequence[int]) -> Optional[Tuple[float, ...]]:
+    """Compute the rates of several counters from a single snapshot
+
+    The counters are stored together with one timestamp under `key`, so a
+    service needs one value store entry no matter how many counters it
+    tracks. Returns None if there is no usable previous snapshot.
+    """
+    last = value_store.get(key)
+    value_store[key] = (this_time, tuple(counters))
+
+    if not last or len(last) != 2:
+        return None
+
+    last_time, last_counters = last
+    if this_time <= last_time or len(last_counters) != len(counters):
+        return None
+
+    elapsed = this_time - last_time
+    return tuple((value - last_value) / elapsed for value, last_value in zip(counters, last_counters))
+
+
+def get_total_rates(value_store, key: str, this_time: float, counters: Sequence[int],
+                    members: Iterable[str]) -> Optional[Tuple[float, ...]]:
+    """Compute the rates of counters summed over several members, like the volumes of a pool
+
+    A sum jumps by the lifetime counters of a member joining and drops by
+    those of a member leaving. So a fingerprint of the members is stored
+    next to the snapshot and there are no rates for an interval in which
+    the members changed. Neither are there if a sum went backwards, e.g.
+    after a counter reset.
+    """
+    indexes = sorted(members)
+    fingerprint = (len(indexes), zlib.crc32('\n'.join(indexes).encode()))
+    changed = value_store.get(f'{key}.members') != fingerprint
+    value_store[f'{key}.members'] = fingerprint
+
+    rates = get_rates(value_store, key, this_time, counters)
+    if changed or rates is None or min(rates) < 0:
+        return None
+    return rates
+
+
+def drop_legacy_rates(value_store, key: str, legacy_keys: Iterable[str]) -> None:
+    """Remove the per counter entries stored by `get_rate` before the snapshot `key`
+
+    This only happens while there is no snapshot under `key` yet, so once
+    after an upgrade. Entries of services which vanished can not be
+    reached from a check function and stay until Checkmk removes them.
+    """
+    if key in value_store:
+        return
+    for legacy_key in legacy_keys:
+        value_store.pop(legacy_key, None)
+
+
+def split_tables(string_table, count: int) -> List[List[List[str]]]:
+    """Split a `dell_eql_bulk_*` agent section into the tables of a SNMP fetch list
+
+    The special agent prefixes each row of a section with more than one
+    table with the index of its table.
+    """
+    tables: List[List[List[str]]] = [[] for _ in range(count)]
+    for table, *row in string_table:
+        tables[int(table)].append(row)
+    return tables
+
+
+def _count(objects) -> int:
+    try:
+        return len(objects)
+    except TypeError:
+        return 1
+
+
+def parse_record(section) -> Optional[ProfileRecord]:
+    """The last parse record of `section`, None if it was not parsed by a profiled function
+
+    A bulk parse function calls the SNMP one and both record the same
+    section, the outermost and thus longest one is returned.
+    """
+    records = [record for record in DELL_EQL_PARSE_PROFILE.values() if record.result is section]
+    return max(records, key=lambda record: record.duration, default=None)
+
+
+def profiled(func):
+    """Time a parse, discovery or check function if DELL_EQL_PROFILE is set
+
+    Without DELL_EQL_PROFILE the function itself is returned, so there is
+    no overhead at all. Parse functions keep the duration and the number
+    of parsed objects of their last run, reported by the dell_eql_profile
+    service of the host. Check functions add their duration as metric.
+    Discovery functions have no output besides their services and log
+    their duration.
+    """
+    if not DELL_EQL_PROFILE:
+        return func
+
+    if func.__name__.startswith('parse_'):
+        @wraps(func)
+        def parse(string_table):
+            start = time.perf_counter()
+            result = func(string_table)
+            DELL_EQL_PARSE_PROFILE[func.__name__] = ProfileRecord(time.perf_counter() - start, _count(result), result)
+            return result
+        return parse
+
+    if func.__name__.startswith('discovery_'):
+        @wraps(func)
+        def discovery(*args, **kwargs):
+            start = time.perf_counter()
+            services = list(func(*args, **kwargs))
+            LOGGER.info('%s: %d services in %.6fs', func.__name__, len(services), time.perf_counter() - start)
+            yield from services
+        return discovery
+
+    @wraps(func)
+    def check(*args, **kwargs):
+        start = time.perf_counter()
+        results = list(func(*args, **kwargs))
+        duration = time.perf_counter() - start
+        yield from results
+        if results:
+            yield Metric('dell_eql_check_time', duration)
+    return check
@@ -34,14 +34,15 @@
 # .1.3.6.1.4.1.12740.5.1.7.34.1.9.1234567890.47 4241488288 --> EQLVOLUME-MIB::eqliscsiVolumeStatsWriteOpCount
 
 
-from typing import NamedTuple
+from array import array
+from collections.abc import Mapping
+from typing import Container, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import re
 import time
-from contextlib import suppress
+import zlib
 from .agent_based_api.v1 import (
     exists,
-    get_rate,
     get_value_store,
-    GetRateError,
     OIDEnd,
     register,
     Result,
@@ -50,15 +51,25 @@ from .agent_based_api.v1 import (
     State,
 )
 from .utils import diskstat
+from .dell_eql_utils import (
+    drop_legacy_rates,
+    get_rates,
+    profiled,
+    split_tables,
+)
 
 
 class EqlVolume(NamedTuple):
+    index: str
     name: str
     desc: str
     status: int
     access: int
     size: int
     pool: str
+
+
+class EqlVolumeStats(NamedTuple):
     write_ios: int
     read_ios: int
     write_throughput: int
@@ -67,32 +78,142 @@ class EqlVolume(NamedTuple):
     read_latency: int
 
 
-def parse_dell_eql_volume(string_table):
-    parsed = []
+class EqlVolumeSection(Mapping):
+    """The volumes by name, decoded on first access
+
+    Parsing only indexes the rows by volume name. A row is converted to
+    an EqlVolume when its volume is looked up for the first time and the
+    record is kept for further lookups. So the parse cost depends on the
+    volumes monitored, not on all volumes of the group, and no copy of
+    the rows is made.
+    """
 
-    pools, vol, volstats = string_table
+    __slots__ = ('_rows', '_pools', '_decoded', '_fingerprint')
 
-    poolname = dict(pools)
-    volstats = dict([(v[0], v[1:]) for v in volstats])
+    def __init__(self, rows: Sequence[Sequence[str]], pools: Dict[str, str]):
+        self._rows = {row[1]: row for row in rows}
+        self._pools = pools
+        self._decoded: Dict[str, EqlVolume] = {}
+        self._fingerprint: Optional[Tuple[int, int]] = None
 
-    for idx, name, desc, access, size, status, pool in vol:
-        parsed.append(
-            EqlVolume(
+    def __getitem__(self, name: str) -> EqlVolume:
+        volume = self._decoded.get(name)
+        if volume is None:
+            idx, name, desc, access, size, status, pool = self._rows[name]
+            volume = self._decoded[name] = EqlVolume(
+                index=idx,
                 name=name,
                 desc=desc,
                 status=int(status),
                 access=int(access),
                 size=int(size) * 1024 * 1024,
-                pool=poolname[pool],
-                write_throughput=int(volstats[idx][0]),
-                read_throughput=int(volstats[idx][1]),
-                write_latency=int(volstats[idx][2]),
-                read_latency=int(volstats[idx][3]),
-                write_ios=int(volstats[idx][4]),
-                read_ios=int(volstats[idx][5]),
+                # A pool missing from a partial walk keeps its index
+                pool=self._pools.get(pool, pool),
             )
-        )
-    return parsed
+        return volume
+
+    def name_indexes(self) -> Iterator[Tuple[str, str]]:
+        """The name and index of every volume, without decoding them"""
+        return ((name, row[0]) for name, row in self._rows.items())
+
+    def fingerprint(self) -> Tuple[int, int]:
+        """The number and a checksum of the names and indexes of the volumes, built once per section"""
+        if self._fingerprint is None:
+            pairs = '\n'.join(f'{name}\t{row[0]}' for name, row in self._rows.items())
+            self._fingerprint = (len(self._rows), zlib.crc32(pairs.encode()))
+        return self._fingerprint
+
+    def pool_indexes(self) -> Dict[str, List[str]]:
+        """The indexes of the volumes of every pool, without decoding them"""
+        pools: Dict[str, List[str]] = {}
+        for row in self._rows.values():
+            pools.setdefault(self._pools.get(row[6], row[6]), []).append(row[0])
+        return pools
+
+    def names(self, indexes: Container[str]) -> Dict[str, str]:
+        """The names of the volumes with the given indexes, without decoding them"""
+        return {row[0]: name for name, row in self._rows.items() if row[0] in indexes}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class EqlVolumeStatsSection(Mapping):
+    """The counters of the volumes by volume index, one typed array per counter"""
+
+    __slots__ = ('_rows', '_columns')
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._columns = tuple(array('Q') for _ in EqlVolumeStats._fields)
+
+    def add(self, index: str, stats: EqlVolumeStats) -> None:
+        row = self._rows.get(index)
+        if row is None:
+            self._rows[index] = len(self._columns[0])
+            for column, value in zip(self._columns, stats):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns, stats):
+                column[row] = value
+
+    def __getitem__(self, index: str) -> EqlVolumeStats:
+        row = self._rows[index]
+        return EqlVolumeStats(*(column[row] for column in self._columns))
+
+    def __contains__(self, index) -> bool:
+        return index in self._rows
+
+    def sums(self, *fields: str) -> Iterator[Tuple[str, int]]:
+        """The index and the sum of the counters `fields` of every volume
+
+        The sums are taken from the columns, without building an
+        EqlVolumeStats per volume. The rows are in the order of the columns.
+        """
+        columns = [self._columns[EqlVolumeStats._fields.index(field)] for field in fields]
+        return zip(self._rows, map(sum, zip(*columns)))
+
+    def total(self, indexes: Iterable[str]) -> Optional[EqlVolumeStats]:
+        """The counters summed over the volumes with the given indexes, None if there are none"""
+        rows = [self._rows[index] for index in indexes if index in self._rows]
+        if not rows:
+            return None
+        return EqlVolumeStats(*(sum(column[row] for row in rows) for column in self._columns))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def summed_disk(rates: Optional[Sequence[float]]) -> Dict[str, float]:
+    """The diskstat values of the rates of counters summed over several volumes
+
+    The summed latency counters grow with the number of volumes, so the
+    latency is weighted per operation, the latency per second divided by
+    the operations per second. Without operations in the interval it is
+    left out.
+    """
+    if not rates:
+        return {}
+    disk = dict(zip(EqlVolumeStats._fields, rates))
+    for latency, ios in (('read_latency', 'read_ios'), ('write_latency', 'write_ios')):
+        latency_rate = disk.pop(latency)
+        if disk[ios] > 0:
+            # The latency counters are in milliseconds
+            disk[latency] = latency_rate / disk[ios] * 0.001
+    return disk
+
+
+@profiled
+def parse_dell_eql_volume(string_table):
+    pools, vol = string_table
+
+    return EqlVolumeSection(vol, dict(pools))
 
 
 register.snmp_section(
@@ -118,22 +239,64 @@ register.snmp_section(
                 '22',  # EQLVOLUME-MIB::eqliscsiVolumeStoragePoolIndex
             ],
         ),
-        SNMPTree(
-            base='.1.3.6.1.4.1.12740.5.1.7.34.1',
-            oids=[
-                OIDEnd(),
-                '3',   # EQLVOLUME-MIB::eqliscsiVolumeStatsTxData
-                '4',   # EQLVOLUME-MIB::eqliscsiVolumeStatsRxData
-                '6',   # EQLVOLUME-MIB::eqliscsiVolumeStatsReadLatency
-                '7',   # EQLVOLUME-MIB::eqliscsiVolumeStatsWriteLatency
-                '8',   # EQLVOLUME-MIB::eqliscsiVolumeStatsReadOpCount
-                '9',   # EQLVOLUME-MIB::eqliscsiVolumeStatsWriteOpCount
-            ],
-        ),
     ],
     parse_function=parse_dell_eql_volume,
 )
 
+
+@profiled
+def parse_dell_eql_bulk_volume(string_table):
+    return parse_dell_eql_volume(split_tables(string_table, 2))
+
+
+register.agent_section(
+    name='dell_eql_bulk_volume',
+    parsed_section_name='dell_eql_volume',
+    parse_function=parse_dell_eql_bulk_volume,
+)
+
+
+@profiled
+def parse_dell_eql_volume_stats(string_table):
+    parsed = EqlVolumeStatsSection()
+
+    for idx, *stats in string_table:
+        parsed.add(idx, EqlVolumeStats(
+            write_throughput=int(stats[0]),
+            read_throughput=int(stats[1]),
+            write_latency=int(stats[2]),
+            read_latency=int(stats[3]),
+            write_ios=int(stats[4]),
+            read_ios=int(stats[5]),
+        ))
+    return parsed
+
+
+register.snmp_section(
+    name='dell_eql_volume_stats',
+    detect=exists('.1.3.6.1.4.1.12740.5.*'),
+    fetch=SNMPTree(
+        base='.1.3.6.1.4.1.12740.5.1.7.34.1',
+        oids=[
+            OIDEnd(),
+            '3',   # EQLVOLUME-MIB::eqliscsiVolumeStatsTxData
+            '4',   # EQLVOLUME-MIB::eqliscsiVolumeStatsRxData
+            '6',   # EQLVOLUME-MIB::eqliscsiVolumeStatsReadLatency
+            '7',   # EQLVOLUME-MIB::eqliscsiVolumeStatsWriteLatency
+            '8',   # EQLVOLUME-MIB::eqliscsiVolumeStatsReadOpCount
+            '9',   # EQLVOLUME-MIB::eqliscsiVolumeStatsWriteOpCount
+        ],
+    ),
+    parse_function=parse_dell_eql_volume_stats,
+)
+
+
+register.agent_section(
+    name='dell_eql_bulk_volume_stats',
+    parsed_section_name='dell_eql_volume_stats',
+    parse_function=parse_dell_eql_volume_stats,
+)
+
 DELL_EQL_VOLUME_STATUS = {
     1: 'on-line',
     2: 'offline',
@@ -148,50 +311,96 @@ DELL_EQL_VOLUME_ACCESS = {
 }
 
 
-def discovery_dell_eql_volume(section):
-    for vol in section:
-        yield Service(item=vol.name, parameters={'adminStatus': vol.status, 'accessType': vol.access})
+class EqlVolumeFilter:
+    """The volume discovery rule, its patterns compiled into one regex per list"""
 
+    __slots__ = ('_include', '_exclude', '_status', '_access')
 
-def check_dell_eql_volume(item, params, section):
-    for vol in section:
-        if not item == vol.name:
-            continue
+    def __init__(self, params):
+        self._include = self._compile(params, 'include')
+        self._exclude = self._compile(params, 'exclude')
+        self._status = set(params['admin_status']) if 'admin_status' in params else None
+        self._access = set(params['access_type']) if 'access_type' in params else None
 
-        if params['adminStatus'] == vol.status:
-            yield Result(state=State.OK, summary=f'Status: {DELL_EQL_VOLUME_STATUS[vol.status]}')
-        else:
-            yield Result(state=State.WARN, summary=f'Status: {DELL_EQL_VOLUME_STATUS[vol.status]} (expected: {DELL_EQL_VOLUME_STATUS[params["adminStatus"]]})')
+    @staticmethod
+    def _compile(params, kind):
+        return [
+            (field, re.compile('|'.join(f'(?:{pattern})' for pattern in params[f'{kind}_{field}'])))
+            for field in ('name', 'desc', 'pool')
+            if params.get(f'{kind}_{field}')
+        ]
 
-        if params['accessType'] == vol.access:
-            yield Result(state=State.OK, summary=f'Access: {DELL_EQL_VOLUME_ACCESS[vol.access]}')
-        else:
-            yield Result(state=State.WARN, summary=f'Access: {DELL_EQL_VOLUME_ACCESS[vol.access]} (expected: {DELL_EQL_VOLUME_ACCESS[params["accessType"]]})')
+    def __call__(self, vol: EqlVolume) -> bool:
+        if self._status is not None and vol.status not in self._status:
+            return False
+        if self._access is not None and vol.access not in self._access:
+            return False
+        for field, regex in self._include:
+            if not regex.match(getattr(vol, field)):
+                return False
+        for field, regex in self._exclude:
+            if regex.match(getattr(vol, field)):
+                return False
+        return True
+
+
+@profiled
+def discovery_dell_eql_volume(params, section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume is None:
+        return
+
+    wanted = EqlVolumeFilter(params)
+    for vol in section_dell_eql_volume.values():
+        if wanted(vol):
+            yield Service(item=vol.name, parameters={'adminStatus': vol.status, 'accessType': vol.access})
+
+
+@profiled
+def check_dell_eql_volume(item, params, section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume is None:
+        return
+
+    vol = section_dell_eql_volume.get(item)
+    if vol is None:
+        return
+
+    if params['adminStatus'] == vol.status:
+        yield Result(state=State.OK, summary=f'Status: {DELL_EQL_VOLUME_STATUS[vol.status]}')
+    else:
+        yield Result(state=State.WARN, summary=f'Status: {DELL_EQL_VOLUME_STATUS[vol.status]} (expected: {DELL_EQL_VOLUME_STATUS[params["adminStatus"]]})')
+
+    if params['accessType'] == vol.access:
+        yield Result(state=State.OK, summary=f'Access: {DELL_EQL_VOLUME_ACCESS[vol.access]}')
+    else:
+        yield Result(state=State.WARN, summary=f'Access: {DELL_EQL_VOLUME_ACCESS[vol.access]} (expected: {DELL_EQL_VOLUME_ACCESS[params["accessType"]]})')
+
+    if vol.desc:
+        yield Result(state=State.OK, summary=f'Description: {vol.desc}')
+    yield Result(state=State.OK, summary=f'Pool: {vol.pool}')
 
-        if vol.desc:
-            yield Result(state=State.OK, summary=f'Description: {vol.desc}')
-        yield Result(state=State.OK, summary=f'Pool: {vol.pool}')
+    stats = (section_dell_eql_volume_stats or {}).get(vol.index)
+    if stats is None:
+        return
 
-        disk = {}
-        value_store = get_value_store()
-        for key in ['read_ios', 'read_throughput', 'read_latency', 'write_ios', 'write_throughput', 'write_latency']:
-            with suppress(GetRateError):
-                disk[key] = get_rate(value_store,
-                                     'check_dell_eql_volume.%s.%s' % (item, key),
-                                     time.time(),
-                                     getattr(vol, key))
+    now = time.time()
+    value_store = get_value_store()
+    drop_legacy_rates(value_store, 'dell_eql_volume', (f'check_dell_eql_volume.{item}.{key}' for key in EqlVolumeStats._fields))
+    rates = get_rates(value_store, 'dell_eql_volume', now, stats)
 
-        yield from diskstat.check_diskstat_dict(
-            params=params,
-            disk=disk,
-            value_store=value_store,
-            this_time=time.time(),
-        )
+    yield from diskstat.check_diskstat_dict(
+        params=params,
+        disk=dict(zip(EqlVolumeStats._fields, rates)) if rates else {},
+        value_store=value_store,
+        this_time=now,
+    )
 
 
 register.check_plugin(
     name='dell_eql_volume',
+    sections=['dell_eql_volume', 'dell_eql_volume_stats'],
     service_name='Volume %s',
+    discovery_ruleset_name='dell_eql_volume_discovery',
+    discovery_default_parameters={},
     discovery_function=discovery_dell_eql_volume,
     check_function=check_dell_eql_volume,
     check_ruleset_name='diskstat',
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# The groups are defined by the dell_eql_volume_groups discovery rule,
+# the counters are those of the dell_eql_volume_stats section.
+
+
+import re
+from typing import Dict, List
+import time
+from .agent_based_api.v1 import (
+    get_value_store,
+    register,
+    Result,
+    Service,
+    State,
+)
+from .utils import diskstat
+from .dell_eql_utils import (
+    get_total_rates,
+    profiled,
+)
+from .dell_eql_volume import summed_disk
+
+
+def group_volumes(section_dell_eql_volume, patterns, value_store=None) -> List[str]:
+    """The indexes of the volumes whose name matches one of the patterns
+
+    The check keeps the indexes in the value store of its service together
+    with the patterns and the fingerprint of the volumes, so the patterns
+    are only matched again when the names or indexes of the volumes change.
+    """
+    key = (tuple(patterns), section_dell_eql_volume.fingerprint())
+    if value_store is not None:
+        cached = value_store.get('dell_eql_volume_group.volumes')
+        if cached and tuple(cached[:2]) == key:
+            return cached[2]
+
+    regex = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+    indexes = [index for name, index in section_dell_eql_volume.name_indexes() if regex.match(name)]
+    if value_store is not None:
+        value_store['dell_eql_volume_group.volumes'] = (key[0], key[1], indexes)
+    return indexes
+
+
+@profiled
+def discovery_dell_eql_volume_group(params, section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume is None:
+        return
+
+    groups: Dict[str, List[str]] = {}
+    for rule in params:
+        for name, patterns in rule.get('groups', []):
+            groups.setdefault(name, patterns)
+
+    for name, patterns in groups.items():
+        if group_volumes(section_dell_eql_volume, patterns):
+            yield Service(item=name, parameters={'patterns': patterns})
+
+
+@profiled
+def check_dell_eql_volume_group(item, params, section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume is None or 'patterns' not in params:
+        return
+
+    value_store = get_value_store()
+    indexes = group_volumes(section_dell_eql_volume, params['patterns'], value_store)
+    yield Result(state=State.OK, summary=f'Volumes: {len(indexes)}')
+
+    if not section_dell_eql_volume_stats:
+        return
+    members = [index for index in indexes if index in section_dell_eql_volume_stats]
+    stats = section_dell_eql_volume_stats.total(members)
+    if stats is None:
+        return
+
+    now = time.time()
+    rates = get_total_rates(value_store, 'dell_eql_volume_group', now, stats, members)
+
+    yield from diskstat.check_diskstat_dict(
+        params=params,
+        disk=summed_disk(rates),
+        value_store=value_store,
+        this_time=now,
+    )
+
+
+register.check_plugin(
+    name='dell_eql_volume_group',
+    sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+    service_name='Volume group %s',
+    discovery_ruleset_name='dell_eql_volume_groups',
+    discovery_ruleset_type=register.RuleSetType.ALL,
+    discovery_default_parameters={},
+    discovery_function=discovery_dell_eql_volume_group,
+    check_function=check_dell_eql_volume_group,
+    check_ruleset_name='diskstat',
+    check_default_parameters={},
+)
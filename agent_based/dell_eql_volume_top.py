@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# The counters are those of the dell_eql_volume_stats section, the names
+# those of the dell_eql_volume section.
+
+
+import heapq
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+import time
+from .agent_based_api.v1 import (
+    check_levels,
+    get_value_store,
+    register,
+    render,
+    Result,
+    Service,
+    State,
+)
+from .dell_eql_utils import profiled
+
+
+class EqlRanking(NamedTuple):
+    title: str
+    counters: Tuple[str, ...]
+    # Counters the interval is divided by instead of the elapsed time
+    per: Optional[Tuple[str, ...]]
+    scale: float
+    render: Callable[[float], str]
+
+
+DELL_EQL_VOLUME_TOP_RANKINGS = {
+    'ios': EqlRanking(
+        title='Operations',
+        counters=('read_ios', 'write_ios'),
+        per=None,
+        scale=1.0,
+        render=lambda value: f'{value:.2f}/s',
+    ),
+    'throughput': EqlRanking(
+        title='Throughput',
+        counters=('read_throughput', 'write_throughput'),
+        per=None,
+        scale=1.0,
+        render=render.iobandwidth,
+    ),
+    'latency': EqlRanking(
+        title='Latency',
+        counters=('read_latency', 'write_latency'),
+        per=('read_ios', 'write_ios'),
+        # The latency counters are in milliseconds
+        scale=0.001,
+        render=render.timespan,
+    ),
+}
+
+
+def interval_values(ranking: EqlRanking, elapsed: float, counters: Dict[str, int], last_counters: Dict[str, int],
+                    per: Dict[str, int], last_per: Dict[str, int]) -> Iterator[Tuple[float, str]]:
+    """The value of every volume in the last interval together with its index
+
+    Volumes without a previous value or with a counter which went
+    backwards are left out.
+    """
+    for index, value in counters.items():
+        last = last_counters.get(index)
+        if last is None or value < last:
+            continue
+        if ranking.per is None:
+            yield (value - last) * ranking.scale / elapsed, index
+            continue
+        ops = per[index] - last_per.get(index, per[index])
+        if ops > 0:
+            yield (value - last) * ranking.scale / ops, index
+
+
+@profiled
+def discovery_dell_eql_volume_top(section_dell_eql_volume, section_dell_eql_volume_stats):
+    if section_dell_eql_volume_stats:
+        yield Service()
+
+
+@profiled
+def check_dell_eql_volume_top(params, section_dell_eql_volume, section_dell_eql_volume_stats):
+    if not section_dell_eql_volume_stats:
+        return
+
+    ranking = DELL_EQL_VOLUME_TOP_RANKINGS[params['rank_by']]
+    counters = dict(section_dell_eql_volume_stats.sums(*ranking.counters))
+    per = dict(section_dell_eql_volume_stats.sums(*ranking.per)) if ranking.per else {}
+
+    yield Result(state=State.OK, summary=f'Volumes: {len(counters)}')
+
+    # One entry holding the counters of all volumes of the group
+    now = time.time()
+    value_store = get_value_store()
+    last = value_store.get('dell_eql_volume_top')
+    value_store['dell_eql_volume_top'] = (now, params['rank_by'], counters, per)
+    if not last or last[1] != params['rank_by'] or now <= last[0]:
+        return
+
+    last_time, _rank_by, last_counters, last_per = last
+    top = heapq.nlargest(
+        params['count'],
+        interval_values(ranking, now - last_time, counters, last_counters, per, last_per),
+    )
+
+    names = section_dell_eql_volume.names({index for _value, index in top}) if section_dell_eql_volume else {}
+    for rank, (value, index) in enumerate(top, 1):
+        yield from check_levels(
+            value=value,
+            levels_upper=params.get('levels'),
+            metric_name=f'dell_eql_volume_top_{params["rank_by"]}_{rank}',
+            render_func=ranking.render,
+            label=f'{ranking.title} #{rank} {names.get(index, index)}',
+            notice_only=rank > 1,
+        )
+
+
+register.check_plugin(
+    name='dell_eql_volume_top',
+    sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+    service_name='Volume top',
+    discovery_function=discovery_dell_eql_volume_top,
+    check_function=check_dell_eql_volume_top,
+    check_ruleset_name='dell_eql_volume_top',
+    check_default_parameters={
+        'count': 10,
+        'rank_by': 'ios',
+    },
+)
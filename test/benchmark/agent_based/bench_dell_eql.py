@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Benchmark parse, discovery and a full check cycle of the Dell
+# EqualLogic plugins on synthetic groups of growing size.
+#
+# Run it in the Checkmk site python, e.g.
+#
+#   python3 test/benchmark/agent_based/bench_dell_eql.py --sizes 10 1000
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Sequence
+
+try:
+    import cmk.base.plugins.agent_based.agent_based_api.v1  # noqa: F401
+except ImportError:
+    # Outside a Checkmk site run against the agent_based API shim of the tests
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shim'))
+
+from cmk.base.plugins.agent_based import (
+    dell_eql_disk,
+    dell_eql_environment,
+    dell_eql_fan,
+    dell_eql_member,
+    dell_eql_pool,
+    dell_eql_temp,
+    dell_eql_volume,
+    dell_eql_volume_group,
+    dell_eql_volume_top,
+)
+
+import generators
+
+SIZES = (10, 1000, 10000, 50000)
+
+PARSE_FUNCTIONS = {
+    'dell_eql_disk': dell_eql_disk.parse_dell_eql_disk,
+    'dell_eql_disk_stats': dell_eql_disk.parse_dell_eql_disk_stats,
+    'dell_eql_environment': dell_eql_environment.parse_dell_eql_environment,
+    'dell_eql_member': dell_eql_member.parse_dell_eql_member,
+    'dell_eql_member_name': dell_eql_member.parse_dell_eql_member_name,
+    'dell_eql_volume': dell_eql_volume.parse_dell_eql_volume,
+    'dell_eql_volume_stats': dell_eql_volume.parse_dell_eql_volume_stats,
+}
+
+
+class Plugin(NamedTuple):
+    generator: Callable[[int], dict]
+    sections: Sequence[str]
+    discovery: Callable
+    check: Callable
+    discovery_params: Any = None
+    check_params: Any = None
+
+
+PLUGINS = {
+    'dell_eql_disk': Plugin(
+        generator=generators.disk,
+        sections=['dell_eql_disk', 'dell_eql_disk_stats', 'dell_eql_member_name'],
+        discovery=dell_eql_disk.discovery_dell_eql_disk,
+        check=dell_eql_disk.check_dell_eql_disk,
+        discovery_params=[{}],
+        check_params={},
+    ),
+    'dell_eql_fan': Plugin(
+        generator=generators.environment,
+        sections=['dell_eql_environment', 'dell_eql_member_name'],
+        discovery=dell_eql_fan.discovery_dell_eql_fan,
+        check=dell_eql_fan.check_dell_eql_fan,
+        discovery_params=[{}],
+        check_params={},
+    ),
+    'dell_eql_member': Plugin(
+        generator=generators.member,
+        sections=['dell_eql_member'],
+        discovery=dell_eql_member.discovery_dell_eql_member,
+        check=dell_eql_member.check_dell_eql_member,
+    ),
+    'dell_eql_pool': Plugin(
+        generator=generators.volume,
+        sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+        discovery=dell_eql_pool.discovery_dell_eql_pool,
+        check=dell_eql_pool.check_dell_eql_pool,
+        check_params={},
+    ),
+    'dell_eql_temp': Plugin(
+        generator=generators.environment,
+        sections=['dell_eql_environment', 'dell_eql_member_name'],
+        discovery=dell_eql_temp.discovery_dell_eql_temp,
+        check=dell_eql_temp.check_dell_eql_temp,
+        discovery_params=[{}],
+        check_params={},
+    ),
+    'dell_eql_volume': Plugin(
+        generator=generators.volume,
+        sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+        discovery=dell_eql_volume.discovery_dell_eql_volume,
+        check=dell_eql_volume.check_dell_eql_volume,
+        discovery_params={},
+        check_params={},
+    ),
+    'dell_eql_volume_group': Plugin(
+        generator=generators.volume,
+        sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+        discovery=dell_eql_volume_group.discovery_dell_eql_volume_group,
+        check=dell_eql_volume_group.check_dell_eql_volume_group,
+        discovery_params=[{'groups': [(f'VOL-{n}', [f'VOL-{n}']) for n in range(10)]}],
+        check_params={},
+    ),
+    'dell_eql_volume_top': Plugin(
+        generator=generators.volume,
+        sections=['dell_eql_volume', 'dell_eql_volume_stats'],
+        discovery=dell_eql_volume_top.discovery_dell_eql_volume_top,
+        check=dell_eql_volume_top.check_dell_eql_volume_top,
+        check_params={'count': 10, 'rank_by': 'ios'},
+    ),
+}
+
+
+class ValueStores:
+    """Hand every checked item its own value store, like Checkmk does"""
+
+    def __init__(self):
+        self._stores = {}
+        self._current = {}
+
+    def select(self, item):
+        self._current = self._stores.setdefault(item, {})
+
+    def __call__(self):
+        return self._current
+
+
+def install_value_stores(value_stores):
+    for module in (dell_eql_disk, dell_eql_pool, dell_eql_temp, dell_eql_volume,
+                   dell_eql_volume_group, dell_eql_volume_top):
+        module.get_value_store = value_stores
+
+
+def run_parse(plugin, string_tables):
+    return [PARSE_FUNCTIONS[name](string_tables[name]) for name in plugin.sections]
+
+
+def run_discovery(plugin, sections):
+    if plugin.discovery_params is not None:
+        return list(plugin.discovery(plugin.discovery_params, *sections))
+    return list(plugin.discovery(*sections))
+
+
+def run_check(plugin, sections, services, value_stores):
+    results = 0
+    for service in services:
+        value_stores.select(service.item)
+        item = () if service.item is None else (service.item,)
+        if plugin.check_params is not None:
+            params = dict(plugin.check_params, **service.parameters)
+            results += len(list(plugin.check(*item, params, *sections)))
+        else:
+            results += len(list(plugin.check(*item, *sections)))
+    return results
+
+
+def measure(func, repeat, setup=None):
+    """The fastest of `repeat` runs of func and the peak memory of one more
+
+    The arguments of func are returned by `setup`, called untimed before
+    every run.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup() if setup else ()
+    tracemalloc.start()
+    func(*args)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def bench(name, size, repeat, value_stores):
+    plugin = PLUGINS[name]
+    string_tables = plugin.generator(size)
+
+    services = run_discovery(plugin, run_parse(plugin, string_tables))
+    # Two cycles to initialise the counters so the rates get computed
+    run_check(plugin, run_parse(plugin, string_tables), services, value_stores)
+    run_check(plugin, run_parse(plugin, string_tables), services, value_stores)
+
+    # Like in production every discovery and check gets freshly parsed
+    # sections, so caches on the sections do not carry over between runs.
+    def parsed():
+        return (run_parse(plugin, string_tables),)
+
+    def cycle():
+        run_check(plugin, run_parse(plugin, string_tables), services, value_stores)
+
+    return [
+        ('parse', measure(lambda: run_parse(plugin, string_tables), repeat)),
+        ('discovery', measure(lambda sections: run_discovery(plugin, sections), repeat, parsed)),
+        ('check', measure(lambda sections: run_check(plugin, sections, services, value_stores), repeat, parsed)),
+        ('cycle', measure(cycle, repeat)),
+    ], len(services)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Dell EqualLogic plugins')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='Number of volumes, disks or sensors per group')
+    parser.add_argument('--plugins', nargs='+', choices=sorted(PLUGINS), default=sorted(PLUGINS),
+                        help='Plugins to benchmark')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement, the fastest one is reported')
+    args = parser.parse_args(argv)
+
+    value_stores = ValueStores()
+    install_value_stores(value_stores)
+
+    print(f'{"plugin":<16} {"size":>6} {"services":>8} {"phase":<10} {"ops/s":>10} {"time":>10} {"peak mem":>10}')
+    for name in args.plugins:
+        for size in args.sizes:
+            phases, services = bench(name, size, args.repeat, value_stores)
+            for phase, (duration, peak) in phases:
+                print(f'{name:<16} {size:>6} {services:>8} {phase:<10} {1 / duration:>10.1f} '
+                      f'{duration * 1000:>8.2f}ms {peak / 1024:>8.0f}KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Synthetic string tables for the Dell EqualLogic sections
+#
+# Every generator returns a dict mapping the section name to the
+# string_table Checkmk would pass to its parse function, for a group
+# holding `size` objects of the given kind.
+
+MEMBERS_MAX = 16
+POOLS = 4
+
+
+def _member_count(size):
+    return max(1, min(MEMBERS_MAX, size // 24))
+
+
+def member_name(members):
+    return [[f'1.{1000000000 + m}', f'MEMBER{m + 1}'] for m in range(members)]
+
+
+def _member_index(n, members):
+    return f'1.{1000000000 + n % members}'
+
+
+def disk(size):
+    members = _member_count(size)
+    return {
+        'dell_eql_member_name': member_name(members),
+        'dell_eql_disk': [
+            [f'{_member_index(n, members)}.{n // members}', '1', str(n // members), '1']
+            for n in range(size)
+        ],
+        'dell_eql_disk_stats': [
+            [f'{_member_index(n, members)}.{n // members}', str(1000000 * n), str(100000 * n)]
+            for n in range(size)
+        ],
+    }
+
+
+def _sensors(size, members, name, value):
+    return [
+        [f'{_member_index(n, members)}.{n // members}', f'{name} {n // members}', str(value), '1',
+         str(value * 3), str(value * 2), str(value // 3), str(value // 2)]
+        for n in range(size)
+    ]
+
+
+def environment(size):
+    members = _member_count(size)
+    return {
+        'dell_eql_member_name': member_name(members),
+        'dell_eql_environment': [
+            _sensors(size, members, 'Backplane sensor', 29),
+            _sensors(size, members, 'Power Cooling Module Fan', 6000),
+        ],
+    }
+
+
+def member(size):
+    return {
+        'dell_eql_member': [
+            [f'MEMBER{m + 1}', f'Shelf {m + 1}', '1', [0] * 16, [0] * 16, '1',
+             '10000000', '1000000', '2000000', '5000000']
+            for m in range(size)
+        ],
+    }
+
+
+def volume(size):
+    return {
+        'dell_eql_volume': [
+            [[f'{p}', f'Pool{p}'] for p in range(POOLS)],
+            [
+                [f'1.{n}', f'VOL-{n:05d}', f'Volume {n}', '1', str(1024 * (n + 1)), '1', f'{n % POOLS}']
+                for n in range(size)
+            ],
+        ],
+        'dell_eql_volume_stats': [
+            [f'1.{n}'] + [str(1000 * n + c) for c in range(6)]
+            for n in range(size)
+        ],
+    }
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Replay recorded or generated SNMP walks of a Dell EqualLogic group
+# through the SNMP sections and check plugins of this package.
+#
+# The section and plugin definitions are taken from the register calls
+# in agent_based/, so the string tables are built from the very
+# SNMPTrees the plugins fetch. Walks use the format of Checkmk's stored
+# walks (`cmk --snmpwalk`), one `OID VALUE` pair per line.
+#
+#   python3 test/benchmark/agent_based/replay.py --walk var/check_mk/snmpwalks/eql01
+#   python3 test/benchmark/agent_based/replay.py --members 50 --volumes 20000
+
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Union
+from unittest import mock
+
+try:
+    import cmk.base.plugins.agent_based.agent_based_api.v1  # noqa: F401
+except ImportError:
+    # Outside a Checkmk site run against the agent_based API shim of the tests
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shim'))
+
+from cmk.base.plugins.agent_based.agent_based_api.v1 import register
+
+PLUGIN_DIR = Path(__file__).resolve().parents[3] / 'agent_based'
+
+EQL = '.1.3.6.1.4.1.12740'
+
+Walk = Dict[str, Union[str, List[int]]]
+
+
+def load_plugins():
+    """Execute the plugin files and record what they register"""
+    sections = {}
+    plugins = {}
+    modules = []
+
+    def snmp_section(**kwargs):
+        sections[kwargs['name']] = kwargs
+
+    def check_plugin(**kwargs):
+        plugins[kwargs['name']] = kwargs
+
+    with mock.patch.object(register, 'snmp_section', snmp_section), \
+            mock.patch.object(register, 'agent_section', lambda **kwargs: None), \
+            mock.patch.object(register, 'check_plugin', check_plugin):
+        for path in sorted(PLUGIN_DIR.glob('dell_eql*.py')):
+            spec = importlib.util.spec_from_file_location(f'cmk.base.plugins.agent_based._replay_{path.stem}', path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            modules.append(module)
+
+    return sections, plugins, modules
+
+
+def read_walk(path) -> Walk:
+    walk = {}
+    with open(path, encoding='utf-8', errors='surrogateescape') as walkfile:
+        for line in walkfile:
+            oid, _, value = line.rstrip('\n').partition(' ')
+            if len(value) > 1 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            walk[oid] = value
+    return walk
+
+
+def write_walk(walk: Walk, path) -> None:
+    with open(path, 'w', encoding='utf-8') as walkfile:
+        for oid in sorted(walk, key=_oid_key):
+            value = walk[oid]
+            if isinstance(value, list):
+                value = '"%s"' % ' '.join('%02X' % byte for byte in value)
+            walkfile.write(f'{oid} {value}\n')
+
+
+def _oid_key(oid):
+    return tuple(int(part) for part in oid.strip('.').split('.') if part)
+
+
+def _to_bytes(value):
+    if isinstance(value, list):
+        return value
+    parts = value.split()
+    if parts and all(len(part) == 2 for part in parts):
+        try:
+            return [int(part, 16) for part in parts]
+        except ValueError:
+            pass
+    return list(value.encode('latin-1', errors='replace'))
+
+
+def _walk_column(walk: Walk, fetchoid: str, binary: bool):
+    prefix = fetchoid + '.'
+    column = {}
+    for oid, value in walk.items():
+        if oid.startswith(prefix):
+            column[oid[len(prefix):]] = _to_bytes(value) if binary else value
+    return column
+
+
+def build_table(tree, walk: Walk):
+    """Build the table Checkmk fetches for one SNMPTree
+
+    Rows are aligned on the OID end of the columns, missing cells are
+    filled with an empty string and OIDEnd() yields the row index.
+    """
+    base = tree.base.rstrip('.')
+    columns = []
+    for oid in tree.oids:
+        column = getattr(oid, 'column', oid)
+        if not isinstance(column, str):
+            columns.append(None)
+            continue
+        binary = getattr(oid, 'encoding', 'string') == 'binary'
+        columns.append(_walk_column(walk, f'{base}.{column}', binary))
+
+    endoids = sorted({endoid for column in columns if column for endoid in column}, key=_oid_key)
+
+    return [
+        [endoid if column is None else column.get(endoid, '') for column in columns]
+        for endoid in endoids
+    ]
+
+
+def build_string_table(section, walk: Walk):
+    fetch = section['fetch']
+    if isinstance(fetch, list):
+        return [build_table(tree, walk) for tree in fetch]
+    return build_table(fetch, walk)
+
+
+def generate_walk(members=3, disks=24, temperatures=8, fans=4, volumes=100, pools=2) -> Walk:
+    """Generate the walk of a group with the given number of objects
+
+    Disks and sensors are counted per member, volumes per group.
+    """
+    walk = {}
+    for m in range(members):
+        midx = f'1.{1000000000 + m}'
+        walk[f'{EQL}.2.1.1.1.9.{midx}'] = f'MEMBER{m + 1}'
+        walk[f'{EQL}.2.1.1.1.7.{midx}'] = f'Shelf {m + 1}'
+        walk[f'{EQL}.2.1.5.1.1.{midx}'] = '1'
+        walk[f'{EQL}.2.1.5.1.2.{midx}'] = [0] * 16
+        walk[f'{EQL}.2.1.5.1.3.{midx}'] = [0] * 16
+        walk[f'{EQL}.2.1.13.1.1.{midx}'] = '1'
+        walk[f'{EQL}.2.1.10.1.1.{midx}'] = '10000000'
+        walk[f'{EQL}.2.1.10.1.2.{midx}'] = '5000000'
+        walk[f'{EQL}.2.1.10.1.3.{midx}'] = '2000000'
+        walk[f'{EQL}.2.1.10.1.4.{midx}'] = '1000000'
+
+        for table, count, name, value in [
+            ('6', temperatures, 'Backplane sensor', 29),
+            ('7', fans, 'Power Cooling Module Fan', 6000),
+        ]:
+            for sidx in range(1, count + 1):
+                walk[f'{EQL}.2.1.{table}.1.2.{midx}.{sidx}'] = f'{name} {sidx}'
+                walk[f'{EQL}.2.1.{table}.1.3.{midx}.{sidx}'] = str(value)
+                walk[f'{EQL}.2.1.{table}.1.4.{midx}.{sidx}'] = '1'
+                walk[f'{EQL}.2.1.{table}.1.5.{midx}.{sidx}'] = str(value * 3)
+                walk[f'{EQL}.2.1.{table}.1.6.{midx}.{sidx}'] = str(value * 2)
+                walk[f'{EQL}.2.1.{table}.1.7.{midx}.{sidx}'] = str(value // 3)
+                walk[f'{EQL}.2.1.{table}.1.8.{midx}.{sidx}'] = str(value // 2)
+
+        for didx in range(disks):
+            walk[f'{EQL}.3.1.1.1.8.{midx}.{didx}'] = '1'
+            walk[f'{EQL}.3.1.1.1.11.{midx}.{didx}'] = str(didx)
+            walk[f'{EQL}.3.1.1.1.17.{midx}.{didx}'] = '1'
+            walk[f'{EQL}.3.1.2.1.2.{midx}.{didx}'] = str(1000000 * didx)
+            walk[f'{EQL}.3.1.2.1.3.{midx}.{didx}'] = str(100000 * didx)
+
+    for pidx in range(pools):
+        walk[f'{EQL}.16.1.1.1.3.1.{pidx}'] = f'Pool{pidx}'
+
+    for vidx in range(volumes):
+        idx = f'1000000000.{vidx}'
+        walk[f'{EQL}.5.1.7.1.1.4.{idx}'] = f'VOL-{vidx:05d}'
+        walk[f'{EQL}.5.1.7.1.1.6.{idx}'] = f'Volume {vidx}'
+        walk[f'{EQL}.5.1.7.1.1.7.{idx}'] = '1'
+        walk[f'{EQL}.5.1.7.1.1.8.{idx}'] = str(1024 * (vidx + 1))
+        walk[f'{EQL}.5.1.7.1.1.9.{idx}'] = '1'
+        walk[f'{EQL}.5.1.7.1.1.22.{idx}'] = str(vidx % pools)
+        for column in ('3', '4', '6', '7', '8', '9'):
+            walk[f'{EQL}.5.1.7.34.1.{column}.{idx}'] = str(1000 * vidx + int(column))
+
+    return walk
+
+
+class ValueStores:
+    """Hand every checked service its own value store, like Checkmk does"""
+
+    def __init__(self):
+        self._stores = {}
+        self._current = {}
+
+    def select(self, plugin, item):
+        self._current = self._stores.setdefault((plugin, item), {})
+
+    def __call__(self):
+        return self._current
+
+
+def _section_kwargs(plugin, parsed):
+    names = plugin.get('sections', [plugin['name']])
+    if len(names) == 1:
+        return {'section': parsed.get(names[0])}
+    return {f'section_{name}': parsed.get(name) for name in names}
+
+
+def discover(plugin, parsed):
+    kwargs = _section_kwargs(plugin, parsed)
+    if 'discovery_ruleset_name' in plugin:
+        params = plugin.get('discovery_default_parameters', {})
+        if plugin.get('discovery_ruleset_type') == register.RuleSetType.ALL:
+            params = [params]
+        kwargs['params'] = params
+    return list(plugin['discovery_function'](**kwargs))
+
+
+def check(plugin, parsed, service):
+    kwargs = _section_kwargs(plugin, parsed)
+    if service.item is not None:
+        kwargs['item'] = service.item
+    if 'check_default_parameters' in plugin:
+        kwargs['params'] = dict(plugin['check_default_parameters'], **service.parameters)
+    return list(plugin['check_function'](**kwargs))
+
+
+def replay(walk: Walk, cycles=2):
+    """Run `cycles` full check cycles on a walk, returns the timings per stage"""
+    sections, plugins, modules = load_plugins()
+    value_stores = ValueStores()
+    for module in modules:
+        if hasattr(module, 'get_value_store'):
+            module.get_value_store = value_stores
+
+    timings = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+        return result
+
+    services = {}
+    for cycle in range(cycles):
+        parsed = {}
+        for name, section in sections.items():
+            string_table = timed(f'table {name}', build_string_table, section, walk)
+            parsed[name] = timed(f'parse {name}', section['parse_function'], string_table)
+
+        for name, plugin in plugins.items():
+            # Like Checkmk, skip plugins none of whose sections are present
+            if all(parsed.get(section) is None for section in plugin.get('sections', [name])):
+                continue
+            if cycle == 0:
+                services[name] = timed(f'discovery {name}', discover, plugin, parsed)
+            for service in services[name]:
+                value_stores.select(name, service.item)
+                timed(f'check {name}', check, plugin, parsed, service)
+
+    return {stage: duration / cycles for stage, duration in timings.items()}, {
+        name: len(found) for name, found in services.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay Dell EqualLogic SNMP walks through the plugins')
+    parser.add_argument('--walk', help='Stored walk to replay instead of a generated one')
+    parser.add_argument('--save', help='Write the generated walk to this file')
+    parser.add_argument('--members', type=int, default=3)
+    parser.add_argument('--disks', type=int, default=24, help='Disks per member')
+    parser.add_argument('--temperatures', type=int, default=8, help='Temperature sensors per member')
+    parser.add_argument('--fans', type=int, default=4, help='Fans per member')
+    parser.add_argument('--volumes', type=int, default=100)
+    parser.add_argument('--pools', type=int, default=2)
+    parser.add_argument('--cycles', type=int, default=2)
+    args = parser.parse_args(argv)
+
+    if args.walk:
+        walk = read_walk(args.walk)
+    else:
+        walk = generate_walk(args.members, args.disks, args.temperatures, args.fans, args.volumes, args.pools)
+        if args.save:
+            write_walk(walk, args.save)
+
+    timings, services = replay(walk, args.cycles)
+
+    print(f'{len(walk)} OIDs, ' + ', '.join(f'{count} {name}' for name, count in sorted(services.items())))
+    for stage, duration in sorted(timings.items(), key=lambda timing: -timing[1]):
+        print(f'{stage:<40} {duration * 1000:>10.2f}ms')
+    print(f'{"total per cycle":<40} {sum(timings.values()) * 1000:>10.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
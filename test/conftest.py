@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Outside a Checkmk site the tests run against the agent_based API shim in
+# test/shim. Tests marked `checkmk` compare output rendered by Checkmk
+# itself (check_levels, render, utils.diskstat and utils.temperature),
+# these only run against the real API.
+
+import sys
+from pathlib import Path
+
+import pytest  # type: ignore[import]
+
+try:
+    import cmk.base.plugins.agent_based.agent_based_api.v1  # noqa: F401
+    USE_SHIM = False
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent / 'shim'))
+    USE_SHIM = True
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'checkmk: compares output rendered by the Checkmk agent_based API')
+
+
+def pytest_collection_modifyitems(config, items):
+    if not USE_SHIM:
+        return
+    skip = pytest.mark.skip(reason='compares output of the Checkmk agent_based API, not of the test shim')
+    for item in items:
+        if 'checkmk' in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+# Minimal stand-in for the agent_based API v1 of Checkmk. It implements
+# just what the Dell EqualLogic plugins use, outputs of check_levels,
+# render and the utils only roughly follow the real ones.
+
+import enum
+import re
+from typing import Any, NamedTuple
+from . import register, render  # noqa: F401
+from .register import RuleSetType  # noqa: F401
+
+
+class State(enum.IntEnum):
+    OK = 0
+    WARN = 1
+    CRIT = 2
+    UNKNOWN = 3
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def worst(cls, *states):
+        if cls.CRIT in states:
+            return cls.CRIT
+        return cls(max(states))
+
+    @classmethod
+    def best(cls, *states):
+        if cls.OK in states:
+            return cls.OK
+        return cls(min(states))
+
+
+class Result(NamedTuple('_Result', [('state', State), ('summary', str), ('details', str)])):
+    def __new__(cls, *, state, summary=None, notice=None, details=None):
+        if (summary is None) == (notice is None):
+            raise TypeError('Either summary or notice is required')
+        text = summary if summary is not None else notice
+        if summary is None and State(state) is not State.OK:
+            summary = notice
+        return super().__new__(cls, state=State(state), summary=summary or '', details=details or text)
+
+
+def _floats(values):
+    return None if values is None else tuple(None if value is None else float(value) for value in values)
+
+
+class Metric(NamedTuple('_Metric', [('name', str), ('value', float), ('levels', Any), ('boundaries', Any)])):
+    def __new__(cls, name, value, *, levels=None, boundaries=None):
+        if not re.match(r'^[a-zA-Z0-9_]+$', name):
+            raise TypeError(f'Invalid metric name: {name!r}')
+        return super().__new__(cls, name, float(value), _floats(levels), _floats(boundaries))
+
+
+class Service(NamedTuple('_Service', [('item', Any), ('parameters', Any), ('labels', Any)])):
+    def __new__(cls, *, item=None, parameters=None, labels=None):
+        return super().__new__(cls, item, parameters or {}, labels or [])
+
+
+class GetRateError(ValueError):
+    pass
+
+
+def get_rate(value_store, key, time, value, *, raise_overflow=False):
+    last = value_store.get(key)
+    value_store[key] = (time, value)
+    if not last or len(last) != 2:
+        raise GetRateError(f'Initialized: {key!r}')
+    last_time, last_value = last
+    if time <= last_time:
+        raise GetRateError('No time difference')
+    rate = (value - last_value) / (time - last_time)
+    if raise_overflow and rate < 0:
+        raise GetRateError('Value overflow')
+    return rate
+
+
+_VALUE_STORE: dict = {}
+
+
+def get_value_store():
+    return _VALUE_STORE
+
+
+class OIDEnd(int):
+    def __new__(cls):
+        return super().__new__(cls, 0)
+
+
+class OIDBytes(str):
+    pass
+
+
+class OIDCached(str):
+    pass
+
+
+class OIDSpec(NamedTuple):
+    column: Any
+    encoding: str
+    save_to_cache: bool
+
+
+class SNMPTree(NamedTuple('_SNMPTree', [('base', str), ('oids', Any)])):
+    """Like the real SNMPTree, keep the columns as specs with an encoding"""
+
+    def __new__(cls, base, oids):
+        specs = []
+        for oid in oids:
+            if isinstance(oid, OIDEnd):
+                specs.append(OIDSpec(0, 'string', False))
+            else:
+                specs.append(OIDSpec(str(oid), 'binary' if isinstance(oid, OIDBytes) else 'string', isinstance(oid, OIDCached)))
+        return super().__new__(cls, base, specs)
+
+
+def exists(oid):
+    return ('exists', oid)
+
+
+def startswith(oid, value):
+    return ('startswith', oid, value)
+
+
+def all_of(*specs):
+    return ('all_of',) + specs
+
+
+def any_of(*specs):
+    return ('any_of',) + specs
+
+
+def _render_float(value):
+    return f'{value:.2f}'
+
+
+def check_levels(value, *, levels_upper=None, levels_lower=None, metric_name=None,
+                 render_func=None, label=None, boundaries=None, notice_only=False):
+    render_func = render_func or _render_float
+    text = render_func(value)
+    if label:
+        text = f'{label}: {text}'
+
+    state = State.OK
+    if levels_upper and value >= levels_upper[1]:
+        state, levels, preposition = State.CRIT, levels_upper, 'at'
+    elif levels_upper and value >= levels_upper[0]:
+        state, levels, preposition = State.WARN, levels_upper, 'at'
+    elif levels_lower and value < levels_lower[1]:
+        state, levels, preposition = State.CRIT, levels_lower, 'below'
+    elif levels_lower and value < levels_lower[0]:
+        state, levels, preposition = State.WARN, levels_lower, 'below'
+    if state is not State.OK:
+        text += f' (warn/crit {preposition} {render_func(levels[0])}/{render_func(levels[1])})'
+
+    if notice_only:
+        yield Result(state=state, notice=text)
+    else:
+        yield Result(state=state, summary=text)
+    if metric_name:
+        yield Metric(metric_name, value, levels=levels_upper, boundaries=boundaries)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import enum
+import inspect
+
+SECTIONS = {}
+CHECK_PLUGINS = {}
+
+
+class RuleSetType(enum.Enum):
+    MERGED = 1
+    ALL = 2
+
+
+def snmp_section(**kwargs):
+    SECTIONS[kwargs['name']] = kwargs
+
+
+def agent_section(**kwargs):
+    SECTIONS[kwargs['name']] = kwargs
+
+
+def _section_arguments(sections):
+    return ['section'] if len(sections) == 1 else [f'section_{section}' for section in sections]
+
+
+def check_plugin(**kwargs):
+    """Register a check plugin after checking the signatures like Checkmk does"""
+    sections = kwargs.get('sections', [kwargs['name']])
+
+    expected = ['params'] if 'discovery_ruleset_name' in kwargs else []
+    expected += _section_arguments(sections)
+    if list(inspect.signature(kwargs['discovery_function']).parameters) != expected:
+        raise TypeError(f'{kwargs["name"]}: discovery function arguments must be {expected}')
+
+    expected = ['item'] if '%s' in kwargs['service_name'] else []
+    expected += ['params'] if 'check_default_parameters' in kwargs else []
+    expected += _section_arguments(sections)
+    if list(inspect.signature(kwargs['check_function']).parameters) != expected:
+        raise TypeError(f'{kwargs["name"]}: check function arguments must be {expected}')
+
+    CHECK_PLUGINS[kwargs['name']] = kwargs
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+def _scale(value, base, units):
+    unit = 0
+    while abs(value) >= base and unit < len(units) - 1:
+        value /= base
+        unit += 1
+    return value, units[unit]
+
+
+def _format(value):
+    if abs(value) < 10:
+        return f'{value:.2f}'
+    if abs(value) < 100:
+        return f'{value:.1f}'
+    return f'{value:.0f}'
+
+
+def bytes(value):
+    value, unit = _scale(value, 1024, ['B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB'])
+    return f'{_format(value)} {unit}'
+
+
+def disksize(value):
+    value, unit = _scale(value, 1000, ['B', 'kB', 'MB', 'GB', 'TB', 'PB'])
+    return f'{_format(value)} {unit}'
+
+
+def iobandwidth(value):
+    return f'{disksize(value)}/s'
+
+
+def timespan(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f'{seconds} seconds'
+    minutes, seconds = divmod(seconds, 60)
+    return f'{minutes} minute{"s" if minutes != 1 else ""} {seconds} seconds'
+
+
+def percent(value):
+    return f'{value:.2f}%'
+
+
+def datetime(value):
+    return str(value)
+
+
+def frequency(value):
+    return f'{value} Hz'
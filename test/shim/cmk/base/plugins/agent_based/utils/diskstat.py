@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from ..agent_based_api.v1 import check_levels, render
+
+
+def _render_ios(value):
+    return f'{value:.2f}/s'
+
+
+# Counter, label, render function, scale of the levels, notice only, parameter
+DISKSTAT_METRICS = [
+    ('read_throughput', 'Read', render.iobandwidth, 1e6, False, 'read'),
+    ('write_throughput', 'Write', render.iobandwidth, 1e6, False, 'write'),
+    ('read_ios', 'Read operations', _render_ios, 1, True, 'read_ios'),
+    ('write_ios', 'Write operations', _render_ios, 1, True, 'write_ios'),
+    ('read_latency', 'Read latency', render.timespan, 1e-3, True, 'read_latency'),
+    ('write_latency', 'Write latency', render.timespan, 1e-3, True, 'write_latency'),
+]
+
+
+def check_diskstat_dict(*, params, disk, value_store, this_time):
+    for key, label, render_func, scale, notice_only, param in DISKSTAT_METRICS:
+        if key not in disk:
+            continue
+        levels = params.get(param)
+        yield from check_levels(
+            disk[key],
+            levels_upper=None if levels is None else (levels[0] * scale, levels[1] * scale),
+            metric_name=f'disk_{key}',
+            render_func=render_func,
+            label=label,
+            notice_only=notice_only,
+        )
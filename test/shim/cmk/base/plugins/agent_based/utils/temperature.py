@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from ..agent_based_api.v1 import Metric, Result, State
+
+UNITS = {
+    'c': (lambda value: value, '°C'),
+    'f': (lambda value: value * 1.8 + 32, '°F'),
+    'k': (lambda value: value + 273.15, 'K'),
+}
+
+
+def check_temperature(reading, params, *, unique_name=None, value_store=None, dev_unit='c', dev_levels=None,
+                      dev_levels_lower=None, dev_status=None, dev_status_name=None):
+    levels = params.get('levels', dev_levels)
+    levels_lower = params.get('levels_lower', dev_levels_lower)
+    convert, unit = UNITS[params.get('output_unit', 'c')]
+
+    def render_temp(value):
+        return f'{int(convert(value))} {unit}'
+
+    state, text = State.OK, ''
+    if levels and reading >= levels[1]:
+        state, text = State.CRIT, f' (warn/crit at {render_temp(levels[0])}/{render_temp(levels[1])})'
+    elif levels and reading >= levels[0]:
+        state, text = State.WARN, f' (warn/crit at {render_temp(levels[0])}/{render_temp(levels[1])})'
+    elif levels_lower and reading < levels_lower[1]:
+        state, text = State.CRIT, f' (warn/crit below {render_temp(levels_lower[0])}/{render_temp(levels_lower[1])})'
+    elif levels_lower and reading < levels_lower[0]:
+        state, text = State.WARN, f' (warn/crit below {render_temp(levels_lower[0])}/{render_temp(levels_lower[1])})'
+
+    yield Metric('temp', reading, levels=levels)
+    yield Result(state=state, summary=f'Temperature: {render_temp(reading)}{text}')
+    yield Result(state=State(dev_status) if dev_status is not None else State.OK,
+                 notice=f'State on device: {dev_status_name}')
+    yield Result(state=State.OK, notice='Configuration: prefer user levels over device levels (used device levels)')
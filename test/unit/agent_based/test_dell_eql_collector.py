@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    render,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_collector
+
+SAMPLE_STRING_TABLE = [
+    ['disk', '0.412', '24', '2', '3480', '0'],
+    ['temperature', '5.005', '0', '2', '0', '2', 'Timeout after 3 attempts'],
+]
+
+
+def test_parse_dell_eql_collector():
+    assert dell_eql_collector.parse_dell_eql_collector(SAMPLE_STRING_TABLE) == {
+        'disk': dell_eql_collector.EqlTableStats(duration=0.412, rows=24, requests=2, bytes=3480, timeouts=0, error=''),
+        'temperature': dell_eql_collector.EqlTableStats(duration=5.005, rows=0, requests=2, bytes=0, timeouts=2, error='Timeout after 3 attempts'),
+    }
+
+
+def test_discovery_dell_eql_collector():
+    section = dell_eql_collector.parse_dell_eql_collector(SAMPLE_STRING_TABLE)
+    assert list(dell_eql_collector.discovery_dell_eql_collector(section)) == [
+        Service(item='disk'),
+        Service(item='temperature'),
+    ]
+
+
+@pytest.mark.parametrize('item, params, result', [
+    ('foo', {}, []),
+    ('disk', {}, [
+        Result(state=State.OK, summary=f'Duration: {render.timespan(0.412)}'),
+        Metric('dell_eql_collector_duration', 0.412),
+        Result(state=State.OK, summary='Rows: 24'),
+        Metric('dell_eql_collector_rows', 24),
+        Result(state=State.OK, notice='Requests: 2'),
+        Metric('dell_eql_collector_requests', 2),
+        Result(state=State.OK, summary=f'Received: {render.bytes(3480)}'),
+        Metric('dell_eql_collector_bytes', 3480),
+        Result(state=State.OK, notice='Timeouts: 0'),
+        Metric('dell_eql_collector_timeouts', 0),
+    ]),
+    ('temperature', {'duration': (1.0, 5.0), 'timeouts': (1, 5)}, [
+        Result(state=State.WARN, summary='Walk failed: Timeout after 3 attempts'),
+        Result(state=State.CRIT, summary=f'Duration: {render.timespan(5.005)} (warn/crit at {render.timespan(1.0)}/{render.timespan(5.0)})'),
+        Metric('dell_eql_collector_duration', 5.005, levels=(1.0, 5.0)),
+        Result(state=State.OK, summary='Rows: 0'),
+        Metric('dell_eql_collector_rows', 0),
+        Result(state=State.OK, notice='Requests: 2'),
+        Metric('dell_eql_collector_requests', 2),
+        Result(state=State.OK, summary=f'Received: {render.bytes(0)}'),
+        Metric('dell_eql_collector_bytes', 0),
+        Result(state=State.WARN, summary='Timeouts: 2 (warn/crit at 1/5)'),
+        Metric('dell_eql_collector_timeouts', 2, levels=(1, 5)),
+    ]),
+])
+@pytest.mark.checkmk
+def test_check_dell_eql_collector(item, params, result):
+    section = dell_eql_collector.parse_dell_eql_collector(SAMPLE_STRING_TABLE)
+    assert list(dell_eql_collector.check_dell_eql_collector(item, params, section)) == result
+
+
+def test_check_dell_eql_collector_walk_failed():
+    section = dell_eql_collector.parse_dell_eql_collector([
+        ['volume', '30.001', '0', '12', '0', '4', 'Timeout after 1 attempts'],
+    ])
+    results = list(dell_eql_collector.check_dell_eql_collector('volume', {}, section))
+    assert results[0] == Result(state=State.WARN, summary='Walk failed: Timeout after 1 attempts')
+    assert State.worst(*(result.state for result in results if isinstance(result, Result))) == State.WARN
@@ -29,8 +29,8 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
 from cmk.base.plugins.agent_based import dell_eql_disk
 
 
-def get_rate(_value_store, _key, _time, value):
-    return value
+def get_rates(_value_store, _key, _time, counters):
+    return counters
 
 
 def get_value_store():
@@ -38,42 +38,72 @@ def get_value_store():
 
 
 SAMPLE_STRING_TABLE = [
-    [['1234567890', 'MEMBER1'], ['1234567891', 'MEMBER2']],
-    [
-        ['1234567890.6', '1', '5', '1', '10676042', '12097'],
-        ['1234567890.7', '2', '6', '2', '10676042', '12097'],
-        ['1234567891.7', '2', '6', '2', '10676042', '12097'],
-    ]
+    ['1234567890.6', '1', '5', '1'],
+    ['1234567890.7', '2', '6', '2'],
+    ['1234567891.7', '2', '6', '2'],
+]
+
+SAMPLE_STATS_STRING_TABLE = [
+    ['1234567890.6', '10676042', '12097'],
+    ['1234567890.7', '10676042', '12097'],
+    ['1234567891.7', '10676042', '12097'],
 ]
 
+SAMPLE_MEMBER_NAME = {'MEMBER1': '1234567890', 'MEMBER2': '1234567891'}
+
 SAMPLE_PARSED = {
-    'MEMBER1.6': {
-        'read_throughput': 10676042,
-        'slot': 5,
-        'smart': 1,
-        'status': 1,
-        'write_throughput': 12097
+    '1234567890': {
+        '6': {
+            'slot': 5,
+            'smart': 1,
+            'status': 1,
+        },
+        '7': {
+            'slot': 6,
+            'smart': 2,
+            'status': 2,
+        },
     },
-    'MEMBER1.7': {
-        'read_throughput': 10676042,
-        'slot': 6,
-        'smart': 2,
-        'status': 2,
-        'write_throughput': 12097
+    '1234567891': {
+        '7': {
+            'slot': 6,
+            'smart': 2,
+            'status': 2,
+        },
     },
-    'MEMBER2.7': {
+}
+
+SAMPLE_STATS = {
+    '1234567890': {
+        'disks': {
+            '6': {
+                'read_throughput': 10676042,
+                'write_throughput': 12097
+            },
+            '7': {
+                'read_throughput': 10676042,
+                'write_throughput': 12097
+            },
+        },
+        'read_throughput': 21352084,
+        'write_throughput': 24194,
+    },
+    '1234567891': {
+        'disks': {
+            '7': {
+                'read_throughput': 10676042,
+                'write_throughput': 12097
+            },
+        },
         'read_throughput': 10676042,
-        'slot': 6,
-        'smart': 2,
-        'status': 2,
-        'write_throughput': 12097
+        'write_throughput': 12097,
     },
 }
 
 
 @pytest.mark.parametrize('string_table, result', [
     (
-        [[], []], {}
+        [], {}
     ),
     (
         SAMPLE_STRING_TABLE,
@@ -84,6 +114,19 @@ def test_parse_dell_eql_disk(string_table, result):
     assert dell_eql_disk.parse_dell_eql_disk(string_table) == result
 
 
+@pytest.mark.parametrize('string_table, result', [
+    (
+        [], {}
+    ),
+    (
+        SAMPLE_STATS_STRING_TABLE,
+        SAMPLE_STATS
+    )
+])
+def test_parse_dell_eql_disk_stats(string_table, result):
+    assert dell_eql_disk.parse_dell_eql_disk_stats(string_table) == result
+
+
 @pytest.mark.parametrize('params, section, result', [
     ([{}], {}, []),
     (
@@ -105,7 +148,7 @@ def test_parse_dell_eql_disk(string_table, result):
     ),
 ])
 def test_discovery_dell_eql_disk(params, section, result):
-    discoverd = list(dell_eql_disk.discovery_dell_eql_disk(params, section))
+    discoverd = list(dell_eql_disk.discovery_dell_eql_disk(params, section, SAMPLE_STATS, SAMPLE_MEMBER_NAME))
     discoverd.sort()
     assert discoverd == result
 
@@ -141,10 +184,39 @@ def test_discovery_dell_eql_disk(params, section, result):
         ]
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_disk(monkeypatch, item, section, result):
-    monkeypatch.setattr(dell_eql_disk, 'get_rate', get_rate)
+    monkeypatch.setattr(dell_eql_disk, 'get_rates', get_rates)
+    monkeypatch.setattr(dell_eql_disk, 'get_value_store', get_value_store)
+    assert list(dell_eql_disk.check_dell_eql_disk(item, {}, section, SAMPLE_STATS, SAMPLE_MEMBER_NAME)) == result
+
+
+@pytest.mark.checkmk
+def test_check_dell_eql_disk_summary_exact_member(monkeypatch):
+    monkeypatch.setattr(dell_eql_disk, 'get_rates', get_rates)
     monkeypatch.setattr(dell_eql_disk, 'get_value_store', get_value_store)
-    assert list(dell_eql_disk.check_dell_eql_disk(item, {}, section)) == result
+    section = dell_eql_disk.parse_dell_eql_disk([
+        ['1.1', '1', '1', '1'],
+        ['10.1', '1', '1', '1'],
+    ])
+    stats = dell_eql_disk.parse_dell_eql_disk_stats([
+        ['1.1', '100', '10'],
+        ['10.1', '200', '20'],
+    ])
+    member_name = {'MEMBER1': '1', 'MEMBER10': '10'}
+    assert list(dell_eql_disk.check_dell_eql_disk('SUMMARY MEMBER1', {}, section, stats, member_name)) == [
+        Result(state=State.OK, notice='MEMBER1.1 Slot: 1 Status: on-line SMART: ok'),
+        Result(state=State.OK, summary='Read: 100 B/s'),
+        Metric('disk_read_throughput', 100.0),
+        Result(state=State.OK, summary='Write: 10.0 B/s'),
+        Metric('disk_write_throughput', 10.0),
+    ]
+
+
+def test_check_dell_eql_disk_wo_stats():
+    assert list(dell_eql_disk.check_dell_eql_disk('MEMBER1.6', {}, SAMPLE_PARSED, None, SAMPLE_MEMBER_NAME)) == [
+        Result(state=State.OK, notice='MEMBER1.6 Slot: 5 Status: on-line SMART: ok'),
+    ]
 
 
 @pytest.mark.parametrize('params, result', [
@@ -173,7 +245,8 @@ def test_check_dell_eql_disk(monkeypatch, item, section, result):
         Result(state=State.CRIT, summary='Write: 12.1 kB/s (warn/crit at 8.00 B/s/9.00 B/s)')
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_disk_w_param(monkeypatch, params, result):
-    monkeypatch.setattr(dell_eql_disk, 'get_rate', get_rate)
+    monkeypatch.setattr(dell_eql_disk, 'get_rates', get_rates)
     monkeypatch.setattr(dell_eql_disk, 'get_value_store', get_value_store)
-    assert result in list(dell_eql_disk.check_dell_eql_disk('MEMBER1.6', params, SAMPLE_PARSED))
+    assert result in list(dell_eql_disk.check_dell_eql_disk('MEMBER1.6', params, SAMPLE_PARSED, SAMPLE_STATS, SAMPLE_MEMBER_NAME))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_environment
+
+
+@pytest.mark.parametrize('string_table, result', [
+    (
+        [[], []],
+        dell_eql_environment.EqlEnvironment(temperatures={}, fans={})
+    ),
+    (
+        [
+            [['1234567890.2', 'Backplane sensor 0', '29', '1', '50', '45', '1', '2']],
+            [
+                ['1234567890.1', 'Power Cooling Module 0 Fan 0', '6000', '1', '14000', '13500', '3000', '3500'],
+                ['1234567891.1', 'Power Cooling Module 0 Fan 0', '6000', '2', '14000', '13500', '3000', '3500'],
+            ],
+        ],
+        dell_eql_environment.EqlEnvironment(
+            temperatures={
+                '1234567890': {
+                    '2': dell_eql_environment.EqlSensor(
+                        name='Backplane sensor 0',
+                        value=29,
+                        state=State.OK,
+                        levels_lower=(2, 1),
+                        levels_upper=(45, 50),
+                    ),
+                },
+            },
+            fans={
+                '1234567890': {
+                    '1': dell_eql_environment.EqlSensor(
+                        name='Power Cooling Module 0 Fan 0',
+                        value=6000,
+                        state=State.OK,
+                        levels_lower=(3500, 3000),
+                        levels_upper=(13500, 14000),
+                    ),
+                },
+                '1234567891': {
+                    '1': dell_eql_environment.EqlSensor(
+                        name='Power Cooling Module 0 Fan 0',
+                        value=6000,
+                        state=State.WARN,
+                        levels_lower=(3500, 3000),
+                        levels_upper=(13500, 14000),
+                    ),
+                },
+            },
+        )
+    ),
+])
+def test_parse_dell_eql_environment(string_table, result):
+    assert dell_eql_environment.parse_dell_eql_environment(string_table) == result
+    assert dell_eql_environment.parse_dell_eql_bulk_environment([
+        [str(table)] + row
+        for table, rows in enumerate(string_table)
+        for row in rows
+    ]) == result
+
+
+@pytest.mark.parametrize('value, result', [
+    (0, State.CRIT),
+    (1, State.WARN),
+    (2, State.OK),
+    (45, State.WARN),
+    (50, State.CRIT),
+])
+def test_levels_state(value, result):
+    assert dell_eql_environment.levels_state(value, (45, 50), (2, 1)) == result
+
+
+def test_summarize_sensors():
+    sensors = {
+        '1': dell_eql_environment.EqlSensor('Sensor 0', 20, State.OK, (2, 1), (45, 50)),
+        '2': dell_eql_environment.EqlSensor('Sensor 1', 47, State.OK, (2, 1), (45, 50)),
+        '3': dell_eql_environment.EqlSensor('Sensor 2', 30, State.CRIT, (2, 1), (45, 50)),
+    }
+    assert dell_eql_environment.summarize_sensors(sensors) == dell_eql_environment.EqlSensorSummary(
+        state=State.CRIT,
+        count=3,
+        minimum=20,
+        maximum=47,
+        average=32.333333333333336,
+        offending=[('Sensor 1', 47, State.WARN), ('Sensor 2', 30, State.CRIT)],
+    )
+    assert dell_eql_environment.summarize_sensors(sensors, levels_upper=(50, 60)).offending == [
+        ('Sensor 2', 30, State.CRIT),
+    ]
+    assert dell_eql_environment.summarize_sensors({}) is None
@@ -26,62 +26,47 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     Service,
     State,
 )
-from cmk.base.plugins.agent_based import dell_eql_fan
+from cmk.base.plugins.agent_based import dell_eql_environment, dell_eql_fan
 
-SAMPLE_STRING_TABLE = [
-    [['1234567890', 'MEMBER1']],
-    [
-        ['1234567890.1', 'Power Cooling Module 0 Fan 0', '6000', '1', '14000', '13500', '3000', '3500'],
-        ['1234567890.2', 'Power Cooling Module 0 Fan 1', '6000', '2', '14000', '13500', '3000', '3500']
-    ],
-]
+SAMPLE_MEMBER_NAME = {'MEMBER1': '1234567890'}
 
-SAMPLE_EQLFAN = [
-    dell_eql_fan.EqlFan(
-        item='MEMBER1.1',
-        name='Power Cooling Module 0 Fan 0',
-        value=6000,
-        state=State.OK,
-        levels_lower=(3500, 3000),
-        levels_upper=(13500, 14000),
-    ),
-    dell_eql_fan.EqlFan(
-        item='MEMBER1.2',
-        name='Power Cooling Module 0 Fan 1',
-        value=6000,
-        state=State.WARN,
-        levels_lower=(3500, 3000),
-        levels_upper=(13500, 14000),
-    )
-]
-
-
-@pytest.mark.parametrize('string_table, result', [
-    (
-        [[], []], []
-    ),
-    (
-        SAMPLE_STRING_TABLE,
-        SAMPLE_EQLFAN
-    ),
-])
-def test_parse_dell_eql_fan(string_table, result):
-    assert dell_eql_fan.parse_dell_eql_fan(string_table) == result
+SAMPLE_EQLFAN = dell_eql_environment.EqlEnvironment(
+    temperatures={},
+    fans={
+        '1234567890': {
+            '1': dell_eql_environment.EqlSensor(
+                name='Power Cooling Module 0 Fan 0',
+                value=6000,
+                state=State.OK,
+                levels_lower=(3500, 3000),
+                levels_upper=(13500, 14000),
+            ),
+            '2': dell_eql_environment.EqlSensor(
+                name='Power Cooling Module 0 Fan 1',
+                value=6000,
+                state=State.WARN,
+                levels_lower=(3500, 3000),
+                levels_upper=(13500, 14000),
+            ),
+        },
+    },
+)
 
 
-@pytest.mark.parametrize('section, result', [
-    ([], []),
+@pytest.mark.parametrize('section, member_name, result', [
+    (dell_eql_environment.EqlEnvironment({}, {}), {}, []),
+    (None, SAMPLE_MEMBER_NAME, []),
     (
-        SAMPLE_EQLFAN,
-        [Service(item=fan.item) for fan in SAMPLE_EQLFAN]
+        SAMPLE_EQLFAN, SAMPLE_MEMBER_NAME,
+        [Service(item='MEMBER1.1'), Service(item='MEMBER1.2')]
     ),
 ])
-def test_discovery_dell_eql_fan(section, result):
-    assert list(dell_eql_fan.discovery_dell_eql_fan(section)) == result
+def test_discovery_dell_eql_fan(section, member_name, result):
+    assert list(dell_eql_fan.discovery_dell_eql_fan([{}], section, member_name)) == result
 
 
 @pytest.mark.parametrize('item, params, section, result', [
-    ('', {}, {}, []),
+    ('', {}, dell_eql_environment.EqlEnvironment({}, {}), []),
     (
         'foo', {},
         SAMPLE_EQLFAN,
@@ -106,8 +91,9 @@ def test_discovery_dell_eql_fan(section, result):
         ]
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_fan(monkeypatch, item, params, section, result):
-    assert list(dell_eql_fan.check_dell_eql_fan(item, params, section)) == result
+    assert list(dell_eql_fan.check_dell_eql_fan(item, params, section, SAMPLE_MEMBER_NAME)) == result
 
 
 @pytest.mark.parametrize('params, result', [
@@ -136,5 +122,30 @@ def test_check_dell_eql_fan(monkeypatch, item, params, section, result):
         Result(state=State.CRIT, summary='Fan Speed: 6000.00 (warn/crit at 4000.00/5000.00)'),
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_fan_w_param(monkeypatch, params, result):
-    assert result in list(dell_eql_fan.check_dell_eql_fan('MEMBER1.1', params, SAMPLE_EQLFAN))
+    assert result in list(dell_eql_fan.check_dell_eql_fan('MEMBER1.1', params, SAMPLE_EQLFAN, SAMPLE_MEMBER_NAME))
+
+
+def test_discovery_dell_eql_fan_summary():
+    assert list(dell_eql_fan.discovery_dell_eql_fan([{'summary': True}], SAMPLE_EQLFAN, SAMPLE_MEMBER_NAME)) == [
+        Service(item='SUMMARY MEMBER1'),
+    ]
+
+
+@pytest.mark.parametrize('item, params, result', [
+    ('SUMMARY MEMBER2', {}, []),
+    ('SUMMARY MEMBER1', {}, [
+        Result(state=State.OK, summary='Fans: 2'),
+        Result(state=State.OK, summary='Min: 6000.00, Max: 6000.00, Average: 6000.00'),
+        Result(state=State.WARN, summary='Not OK: Power Cooling Module 0 Fan 1 (6000.00)'),
+        Metric('fan', 6000.0),
+    ]),
+    ('SUMMARY MEMBER1', {'upper': (4000, 5000), 'output_metrics': False}, [
+        Result(state=State.OK, summary='Fans: 2'),
+        Result(state=State.OK, summary='Min: 6000.00, Max: 6000.00, Average: 6000.00'),
+        Result(state=State.CRIT, summary='Not OK: Power Cooling Module 0 Fan 0 (6000.00), Power Cooling Module 0 Fan 1 (6000.00)'),
+    ]),
+])
+def test_check_dell_eql_fan_summary(item, params, result):
+    assert list(dell_eql_fan.check_dell_eql_fan(item, params, SAMPLE_EQLFAN, SAMPLE_MEMBER_NAME)) == result
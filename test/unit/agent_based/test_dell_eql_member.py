@@ -28,6 +28,58 @@ from cmk.base.plugins.agent_based import dell_eql_member
     ([0, 0, 0, 1], [31]),
     ([8, 4, 2, 1], [4, 13, 22, 31]),
     ([0, 0, 0, 15], [28, 29, 30, 31]),
+    ([0] * 16, []),
+    ([128] + [0] * 14 + [1], [0, 127]),
+    ([0, 0, 0, 0, 64] + [0] * 11, [33]),
 ])
 def test_byte_to_index(bytelist, result):
     assert list(dell_eql_member.byte_to_index(bytelist)) == result
+
+
+@pytest.mark.parametrize('bytelist, result', [
+    ((0,) * 16, ()),
+    ((128, 0, 0, 1) + (0,) * 12, ('hwComponentFailedWarn', 'batteryEndOfLifeWarning')),
+    ((0, 0, 0, 0, 64) + (0,) * 11, ('unknown(33)',)),
+])
+def test_decode_conditions(bytelist, result):
+    assert dell_eql_member.decode_conditions(bytelist, dell_eql_member.DELL_EQL_WARNING_CONDITIONS) == result
+
+
+SAMPLE_STRING_TABLE = [
+    ['MEMBER1', 'Shelf 1', '1', [0] * 16, [0] * 16, '1', '1000', '100', '200', '500'],
+    ['MEMBER2', '', '2', [0, 0, 0, 1] + [0] * 12, [0] * 16, '2', '1000', '100', '200', '500'],
+]
+
+
+def test_parse_dell_eql_member():
+    parsed = dell_eql_member.parse_dell_eql_member(SAMPLE_STRING_TABLE)
+    assert list(parsed) == ['MEMBER1', 'MEMBER2']
+    assert parsed['MEMBER2'].warnings == ['batteryEndOfLifeWarning']
+    assert parsed['MEMBER2'].raid == 2
+
+
+@pytest.mark.parametrize('item, result', [
+    ('foo', 0),
+    ('MEMBER1', 6),
+    ('MEMBER2', 6),
+])
+def test_check_dell_eql_member(item, result):
+    section = dell_eql_member.parse_dell_eql_member(SAMPLE_STRING_TABLE)
+    assert len(list(dell_eql_member.check_dell_eql_member(item, section))) == result
+
+
+def test_parse_dell_eql_bulk_member():
+    assert dell_eql_member.parse_dell_eql_bulk_member([
+        ['MEMBER1', 'Shelf 1', '1', '00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00', '00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00', '1', '1000', '100', '200', '500'],
+        ['MEMBER2', '', '2', '00 00 00 01 00 00 00 00 00 00 00 00 00 00 00 00', '00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00', '2', '1000', '100', '200', '500'],
+    ]) == dell_eql_member.parse_dell_eql_member(SAMPLE_STRING_TABLE)
+
+
+def test_parse_dell_eql_member_name():
+    assert dell_eql_member.parse_dell_eql_member_name([
+        ['1.1234567890', 'MEMBER1'],
+        ['1.1234567891', 'MEMBER2'],
+    ]) == {
+        'MEMBER1': '1.1234567890',
+        'MEMBER2': '1.1234567891',
+    }
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    render,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_pool, dell_eql_volume
+
+
+def get_total_rates(_value_store, _key, _time, counters, _members):
+    return counters
+
+
+def get_value_store():
+    return {}
+
+
+SECTION = dell_eql_volume.parse_dell_eql_volume([
+    [['1', 'Pool1'], ['2', 'Pool2']],
+    [
+        ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+        ['1.2', 'LUN1', '', '1', '1024', '1', '1'],
+        ['1.3', 'LUN2', '', '1', '1024', '1', '2'],
+    ],
+])
+
+SECTION_STATS = dell_eql_volume.parse_dell_eql_volume_stats([
+    ['1.1', '10', '20', '30', '40', '50', '60'],
+    ['1.2', '1', '2', '3', '4', '5', '6'],
+])
+
+
+def test_sum_pools():
+    assert dell_eql_pool.sum_pools(SECTION, SECTION_STATS) == {
+        'Pool1': dell_eql_pool.EqlPool(
+            volumes=2,
+            stats=dell_eql_volume.EqlVolumeStats(
+                write_ios=55,
+                read_ios=66,
+                write_throughput=11,
+                read_throughput=22,
+                write_latency=33,
+                read_latency=44,
+            ),
+            members=['1.1', '1.2'],
+        ),
+        'Pool2': dell_eql_pool.EqlPool(volumes=1, stats=None, members=[]),
+    }
+
+
+def test_sum_pools_lazy():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.2', 'BROKEN', '', 'x', '', '1', '1'],
+        ],
+    ])
+    # The volumes are not decoded, a broken row would raise
+    assert dell_eql_pool.sum_pools(section, SECTION_STATS)['Pool1'].volumes == 2
+
+
+def test_sum_pools_cached():
+    pools = dell_eql_pool.sum_pools(SECTION, SECTION_STATS)
+    assert dell_eql_pool.sum_pools(SECTION, SECTION_STATS) is pools
+    assert dell_eql_pool.sum_pools(SECTION, None) is not pools
+
+
+def test_discovery_dell_eql_pool():
+    assert list(dell_eql_pool.discovery_dell_eql_pool(SECTION, SECTION_STATS)) == [
+        Service(item='Pool1'),
+        Service(item='Pool2'),
+    ]
+    assert list(dell_eql_pool.discovery_dell_eql_pool(None, None)) == []
+
+
+@pytest.mark.parametrize('item, result', [
+    ('Pool0', []),
+    ('Pool2', [Result(state=State.OK, summary='Volumes: 1')]),
+    ('Pool1', [
+        Result(state=State.OK, summary='Volumes: 2'),
+        Result(state=State.OK, summary='Read: 22.0 B/s'),
+        Metric('disk_read_throughput', 22.0),
+        Result(state=State.OK, summary='Write: 11.0 B/s'),
+        Metric('disk_write_throughput', 11.0),
+        Result(state=State.OK, notice='Read operations: 66.00/s'),
+        Metric('disk_read_ios', 66.0),
+        Result(state=State.OK, notice='Write operations: 55.00/s'),
+        Metric('disk_write_ios', 55.0),
+        Result(state=State.OK, notice=f'Read latency: {render.timespan(44 / 66 * 0.001)}'),
+        Metric('disk_read_latency', 44 / 66 * 0.001),
+        Result(state=State.OK, notice=f'Write latency: {render.timespan(33 / 55 * 0.001)}'),
+        Metric('disk_write_latency', 33 / 55 * 0.001),
+    ]),
+])
+@pytest.mark.checkmk
+def test_check_dell_eql_pool(monkeypatch, item, result):
+    monkeypatch.setattr(dell_eql_pool, 'get_total_rates', get_total_rates)
+    monkeypatch.setattr(dell_eql_pool, 'get_value_store', get_value_store)
+    assert list(dell_eql_pool.check_dell_eql_pool(item, {}, SECTION, SECTION_STATS)) == result
+
+
+@pytest.mark.checkmk
+def test_check_dell_eql_pool_volume_joins(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(dell_eql_pool, 'get_value_store', lambda: value_store)
+    joined_section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1'], ['2', 'Pool2']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.2', 'LUN1', '', '1', '1024', '1', '1'],
+            ['1.3', 'LUN2', '', '1', '1024', '1', '1'],
+        ],
+    ])
+    joined_stats = dell_eql_volume.parse_dell_eql_volume_stats([
+        ['1.1', '10', '20', '30', '40', '50', '60'],
+        ['1.2', '1', '2', '3', '4', '5', '6'],
+        ['1.3', '6000000000000', '0', '0', '0', '0', '0'],
+    ])
+
+    for now, section, stats in [(0, SECTION, SECTION_STATS), (60, joined_section, joined_stats)]:
+        monkeypatch.setattr(dell_eql_pool.time, 'time', lambda: now)
+        assert list(dell_eql_pool.check_dell_eql_pool('Pool1', {}, section, stats))[1:] == []
+
+    monkeypatch.setattr(dell_eql_pool.time, 'time', lambda: 120)
+    assert Metric('disk_write_throughput', 0.0) in list(dell_eql_pool.check_dell_eql_pool('Pool1', {}, joined_section, joined_stats))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    render,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_profile, dell_eql_utils
+
+
+def test_discovery_dell_eql_profile(monkeypatch):
+    sections = [None] * len(dell_eql_profile.DELL_EQL_PROFILE_SECTIONS)
+    monkeypatch.setattr(dell_eql_profile, 'DELL_EQL_PROFILE', False)
+    assert list(dell_eql_profile.discovery_dell_eql_profile(*sections)) == []
+    monkeypatch.setattr(dell_eql_profile, 'DELL_EQL_PROFILE', True)
+    assert list(dell_eql_profile.discovery_dell_eql_profile(*sections)) == [Service()]
+
+
+def test_check_dell_eql_profile(monkeypatch):
+    member, volume, unknown = {}, {}, {}
+    monkeypatch.setattr(dell_eql_utils, 'DELL_EQL_PARSE_PROFILE', {
+        'parse_dell_eql_member': dell_eql_utils.ProfileRecord(0.5, 2, member),
+        'parse_dell_eql_volume': dell_eql_utils.ProfileRecord(1.0, 100, volume),
+        'parse_dell_eql_bulk_volume': dell_eql_utils.ProfileRecord(1.5, 100, volume),
+    })
+    assert list(dell_eql_profile.check_dell_eql_profile(
+        section_dell_eql_collector=None,
+        section_dell_eql_disk=unknown,
+        section_dell_eql_disk_stats=None,
+        section_dell_eql_environment=None,
+        section_dell_eql_member=member,
+        section_dell_eql_member_name=None,
+        section_dell_eql_volume=volume,
+        section_dell_eql_volume_stats=None,
+    )) == [
+        Result(state=State.OK, notice=f'dell_eql_member: {render.timespan(0.5)}, 2 objects'),
+        Result(state=State.OK, notice=f'dell_eql_volume: {render.timespan(1.5)}, 100 objects'),
+        Result(state=State.OK, summary=f'Parse time: {render.timespan(2.0)}, 102 objects'),
+        Metric('dell_eql_parse_time', 2.0),
+        Metric('dell_eql_parse_objects', 102),
+    ]
@@ -26,86 +26,50 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     Service,
     State,
 )
-from cmk.base.plugins.agent_based import dell_eql_temp
+from cmk.base.plugins.agent_based import dell_eql_environment, dell_eql_temp
 
 
 def get_value_store():
     return {}
 
 
-@pytest.mark.parametrize('string_table, result', [
-    (
-        [[], []], []
-    ),
-    (
-        [
-            [['1234567890', 'MEMBER1']],
-            [['1234567890.1', 'Backplane sensor 0', '29', '1', '50', '45', '1', '2']]
-        ],
-        [
-            dell_eql_temp.EqlTemperature(
-                item='MEMBER1.1',
+SAMPLE_MEMBER_NAME = {'MEMBER1': '1234567890'}
+
+SAMPLE_EQLTEMP = dell_eql_environment.EqlEnvironment(
+    temperatures={
+        '1234567890': {
+            '1': dell_eql_environment.EqlSensor(
                 name='Backplane sensor 0',
                 value=29,
                 state=State.OK,
                 levels_lower=(2, 1),
                 levels_upper=(45, 50)
-            )
-        ]
-    ),
-])
-def test_parse_dell_eql_temp(string_table, result):
-    assert dell_eql_temp.parse_dell_eql_temp(string_table) == result
+            ),
+        },
+    },
+    fans={},
+)
 
 
-@pytest.mark.parametrize('section, result', [
-    ([], []),
-    (
-        [
-            dell_eql_temp.EqlTemperature(
-                item='MEMBER1.1',
-                name='Backplane sensor 0',
-                value=29,
-                state=State.OK,
-                levels_lower=(2, 1),
-                levels_upper=(45, 50)
-            )
-        ],
-        [Service(item='MEMBER1.1')]
-    ),
+@pytest.mark.parametrize('section, member_name, result', [
+    (dell_eql_environment.EqlEnvironment({}, {}), {}, []),
+    (SAMPLE_EQLTEMP, None, []),
+    (SAMPLE_EQLTEMP, SAMPLE_MEMBER_NAME, [Service(item='MEMBER1.1')]),
 ])
-def test_discovery_dell_eql_temp(section, result):
-    assert list(dell_eql_temp.discovery_dell_eql_temp(section)) == result
+def test_discovery_dell_eql_temp(section, member_name, result):
+    assert list(dell_eql_temp.discovery_dell_eql_temp([{}], section, member_name)) == result
 
 
 @pytest.mark.parametrize('item, params, section, result', [
-    ('', {}, {}, []),
+    ('', {}, dell_eql_environment.EqlEnvironment({}, {}), []),
     (
         'foo', {},
-        [
-            dell_eql_temp.EqlTemperature(
-                item='MEMBER1.1',
-                name='Backplane sensor 0',
-                value=29,
-                state=State.OK,
-                levels_lower=(2, 1),
-                levels_upper=(45, 50)
-            )
-        ],
+        SAMPLE_EQLTEMP,
         []
     ),
     (
         'MEMBER1.1', {},
-        [
-            dell_eql_temp.EqlTemperature(
-                item='MEMBER1.1',
-                name='Backplane sensor 0',
-                value=29,
-                state=State.OK,
-                levels_lower=(2, 1),
-                levels_upper=(45, 50)
-            )
-        ],
+        SAMPLE_EQLTEMP,
         [
             Result(state=State.OK, summary='Backplane sensor 0'),
             Metric('temp', 29.0, levels=(45.0, 50.0)),
@@ -115,9 +79,10 @@ def test_discovery_dell_eql_temp(section, result):
         ]
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_temp(monkeypatch, item, params, section, result):
     monkeypatch.setattr(dell_eql_temp, 'get_value_store', get_value_store)
-    assert list(dell_eql_temp.check_dell_eql_temp(item, params, section)) == result
+    assert list(dell_eql_temp.check_dell_eql_temp(item, params, section, SAMPLE_MEMBER_NAME)) == result
 
 
 @pytest.mark.parametrize('params, result', [
@@ -158,15 +123,43 @@ def test_check_dell_eql_temp(monkeypatch, item, params, section, result):
         Result(state=State.OK, summary='Temperature: 295 K'),
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_temp_w_param(monkeypatch, params, result):
     monkeypatch.setattr(dell_eql_temp, 'get_value_store', get_value_store)
-    assert result in list(dell_eql_temp.check_dell_eql_temp('MEMBER1.1', params, [
-        dell_eql_temp.EqlTemperature(
-            item='MEMBER1.1',
-            name='Backplane sensor 0',
-            value=22,
-            state=State.OK,
-            levels_lower=(2, 1),
-            levels_upper=(45, 50)
-        )
-    ]))
+    assert result in list(dell_eql_temp.check_dell_eql_temp('MEMBER1.1', params, dell_eql_environment.EqlEnvironment(
+        temperatures={
+            '1234567890': {
+                '1': dell_eql_environment.EqlSensor(
+                    name='Backplane sensor 0',
+                    value=22,
+                    state=State.OK,
+                    levels_lower=(2, 1),
+                    levels_upper=(45, 50)
+                ),
+            },
+        },
+        fans={},
+    ), SAMPLE_MEMBER_NAME))
+
+
+def test_discovery_dell_eql_temp_summary():
+    assert list(dell_eql_temp.discovery_dell_eql_temp([{'summary': True}], SAMPLE_EQLTEMP, SAMPLE_MEMBER_NAME)) == [
+        Service(item='SUMMARY MEMBER1'),
+    ]
+
+
+@pytest.mark.parametrize('params, result', [
+    ({}, [
+        Result(state=State.OK, summary='Sensors: 1'),
+        Result(state=State.OK, summary='Min: 29.0 °C, Max: 29.0 °C, Average: 29.0 °C'),
+        Metric('temp', 29),
+    ]),
+    ({'levels': (25, 30)}, [
+        Result(state=State.OK, summary='Sensors: 1'),
+        Result(state=State.OK, summary='Min: 29.0 °C, Max: 29.0 °C, Average: 29.0 °C'),
+        Result(state=State.WARN, summary='Not OK: Backplane sensor 0 (29.0 °C)'),
+        Metric('temp', 29),
+    ]),
+])
+def test_check_dell_eql_temp_summary(params, result):
+    assert list(dell_eql_temp.check_dell_eql_temp('SUMMARY MEMBER1', params, SAMPLE_EQLTEMP, SAMPLE_MEMBER_NAME)) == result
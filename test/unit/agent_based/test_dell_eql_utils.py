@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_utils
+
+
+@pytest.mark.parametrize('value_store, this_time, counters, result', [
+    ({}, 100, (10, 20), None),
+    ({'key': (100, (10, 20))}, 100, (10, 20), None),
+    ({'key': (100, (10, 20))}, 90, (10, 20), None),
+    ({'key': (100, (10,))}, 110, (10, 20), None),
+    ({'key': (100, (10, 20))}, 110, (110, 20), (10.0, 0.0)),
+    ({'key': (100, (10, 20))}, 104, (10, 0), (0.0, -5.0)),
+])
+def test_get_rates(value_store, this_time, counters, result):
+    assert dell_eql_utils.get_rates(value_store, 'key', this_time, counters) == result
+    assert value_store == {'key': (this_time, counters)}
+
+
+def test_get_total_rates():
+    value_store = {}
+    assert dell_eql_utils.get_total_rates(value_store, 'key', 10, (10, 20), ['1.1', '1.2']) is None
+    assert dell_eql_utils.get_total_rates(value_store, 'key', 20, (20, 40), ['1.2', '1.1']) == (1.0, 2.0)
+    # A member joins
+    assert dell_eql_utils.get_total_rates(value_store, 'key', 30, (5000, 5000), ['1.1', '1.2', '1.3']) is None
+    assert dell_eql_utils.get_total_rates(value_store, 'key', 40, (5010, 5010), ['1.1', '1.2', '1.3']) == (1.0, 1.0)
+    # A counter went backwards
+    assert dell_eql_utils.get_total_rates(value_store, 'key', 50, (0, 5010), ['1.1', '1.2', '1.3']) is None
+
+
+def test_drop_legacy_rates():
+    value_store = {
+        'dell_eql_disk.SUMMARY MEMBER1.read_throughput': (100, 10),
+        'dell_eql_disk.SUMMARY MEMBER1.write_throughput': (950, 10),
+        'other': (100, 10),
+    }
+    legacy_keys = ['dell_eql_disk.SUMMARY MEMBER1.read_throughput', 'dell_eql_disk.SUMMARY MEMBER1.write_throughput']
+    dell_eql_utils.drop_legacy_rates(value_store, 'dell_eql_disk', legacy_keys)
+    assert value_store == {'other': (100, 10)}
+
+    value_store = {'dell_eql_disk': (1000, (10, 20)), 'dell_eql_disk.SUMMARY MEMBER1.read_throughput': (100, 10)}
+    dell_eql_utils.drop_legacy_rates(value_store, 'dell_eql_disk', legacy_keys)
+    assert 'dell_eql_disk.SUMMARY MEMBER1.read_throughput' in value_store
+
+
+@pytest.mark.parametrize('string_table, count, result', [
+    ([], 2, [[], []]),
+    ([['0', 'a'], ['1', 'b', 'c'], ['0', 'd']], 2, [[['a'], ['d']], [['b', 'c']]]),
+])
+def test_split_tables(string_table, count, result):
+    assert dell_eql_utils.split_tables(string_table, count) == result
+
+
+def parse_sample(string_table):
+    return {idx: value for idx, value in string_table}
+
+
+def discovery_sample(section):
+    for idx in section:
+        yield Service(item=idx)
+
+
+def check_sample(item, section):
+    if item in section:
+        yield Result(state=State.OK, summary=section[item])
+
+
+def test_profiled_disabled(monkeypatch):
+    monkeypatch.setattr(dell_eql_utils, 'DELL_EQL_PROFILE', False)
+    for func in (parse_sample, discovery_sample, check_sample):
+        assert dell_eql_utils.profiled(func) is func
+
+
+def test_profiled(monkeypatch):
+    monkeypatch.setattr(dell_eql_utils, 'DELL_EQL_PROFILE', True)
+    monkeypatch.setattr(dell_eql_utils, 'DELL_EQL_PARSE_PROFILE', {})
+    parse = dell_eql_utils.profiled(parse_sample)
+    discovery = dell_eql_utils.profiled(discovery_sample)
+    check = dell_eql_utils.profiled(check_sample)
+
+    section = parse([['1', 'a'], ['2', 'b']])
+    assert section == {'1': 'a', '2': 'b'}
+    assert dell_eql_utils.parse_record(section).objects == 2
+
+    assert list(discovery(section=section)) == [Service(item='1'), Service(item='2')]
+
+    results = list(check(item='1', section=section))
+    assert results[0] == Result(state=State.OK, summary='a')
+    assert [metric.name for metric in results[1:]] == ['dell_eql_check_time']
+    assert list(check(item='3', section=section)) == []
+
+
+def test_profiled_last_record(monkeypatch):
+    monkeypatch.setattr(dell_eql_utils, 'DELL_EQL_PROFILE', True)
+    monkeypatch.setattr(dell_eql_utils, 'DELL_EQL_PARSE_PROFILE', {})
+    parse = dell_eql_utils.profiled(parse_sample)
+    sections = [parse([]) for _ in range(10)]
+    assert list(dell_eql_utils.DELL_EQL_PARSE_PROFILE) == ['parse_sample']
+    # Equal but not the same section
+    assert dell_eql_utils.parse_record(sections[0]) is None
+    assert dell_eql_utils.parse_record(sections[-1]).result is sections[-1]
@@ -29,112 +29,192 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
 from cmk.base.plugins.agent_based import dell_eql_volume
 
 
-def get_rate(_value_store, _key, _time, value):
-    return value
+def get_rates(_value_store, _key, _time, counters):
+    return counters
 
 
 def get_value_store():
     return {}
 
 
+SAMPLE_STATS = {
+    '1.2': dell_eql_volume.EqlVolumeStats(
+        write_ios=50,
+        read_ios=60,
+        write_throughput=10,
+        read_throughput=20,
+        write_latency=30,
+        read_latency=40
+    ),
+}
+
+
 @pytest.mark.parametrize('string_table, result', [
     (
-        [[], [], []], []
+        [[], []], {}
     ),
     (
         [
             [['1.2', 'Member1']],
             [['1.2', 'SAN-LUN0', '', '1', '1024000', '1', '1.2']],
-            [['1.2', '10', '20', '30', '40', '50', '60']]
         ],
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='',
                 status=1,
                 access=1,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ]
+        }
     ),
 ])
 def test_parse_dell_eql_volume(string_table, result):
     assert dell_eql_volume.parse_dell_eql_volume(string_table) == result
 
 
+def test_parse_dell_eql_volume_section():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1'], ['2', 'Pool2']],
+        [
+            ['1.1', 'LUN0', 'Clone', '1', '1024', '1', '1'],
+            ['1.2', 'LUN1', 'Clone', '2', '2048', '2', '2'],
+            ['1.3', 'LUN0', '', '1', '4096', '1', '2'],
+        ],
+    ])
+    assert isinstance(section, dell_eql_volume.EqlVolumeSection)
+    assert len(section) == 2
+    assert list(section) == ['LUN0', 'LUN1']
+    assert section['LUN0'] == dell_eql_volume.EqlVolume(
+        index='1.3', name='LUN0', desc='', status=1, access=1, size=4294967296, pool='Pool2',
+    )
+    assert section['LUN1'].desc == 'Clone'
+    assert section.get('LUN2') is None
+    assert 'LUN2' not in section
+
+
+def test_parse_dell_eql_volume_lazy():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.2', 'BROKEN', '', 'x', '', '1', '9'],
+        ],
+    ])
+    assert list(section) == ['LUN0', 'BROKEN']
+    assert section['LUN0'] is section['LUN0']
+    with pytest.raises(ValueError):
+        section['BROKEN']
+
+
+def test_parse_dell_eql_bulk_volume():
+    assert dell_eql_volume.parse_dell_eql_bulk_volume([
+        ['0', '1.2', 'Member1'],
+        ['1', '1.2', 'SAN-LUN0', '', '1', '1024000', '1', '1.2'],
+    ]) == dell_eql_volume.parse_dell_eql_volume([
+        [['1.2', 'Member1']],
+        [['1.2', 'SAN-LUN0', '', '1', '1024000', '1', '1.2']],
+    ])
+
+
+@pytest.mark.parametrize('string_table, result', [
+    ([], {}),
+    ([['1.2', '10', '20', '30', '40', '50', '60']], SAMPLE_STATS),
+])
+def test_parse_dell_eql_volume_stats(string_table, result):
+    assert dell_eql_volume.parse_dell_eql_volume_stats(string_table) == result
+
+
+def test_parse_dell_eql_volume_stats_columnar():
+    section = dell_eql_volume.parse_dell_eql_volume_stats([
+        ['1.2', '10', '20', '30', '40', '50', '60'],
+        ['1.3', '18446744073709551615', '0', '0', '0', '0', '0'],
+        ['1.2', '11', '21', '31', '41', '51', '61'],
+    ])
+    assert len(section) == 2
+    assert section['1.2'].read_ios == 61
+    assert section['1.3'].write_throughput == 18446744073709551615
+
+
 @pytest.mark.parametrize('section, result', [
-    ([], []),
+    ({}, []),
     (
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='',
                 status=1,
                 access=1,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ],
+        },
         [Service(item='SAN-LUN0', parameters={'adminStatus': 1, 'accessType': 1})]
     ),
 ])
 def test_discovery_dell_eql_volume(section, result):
-    assert list(dell_eql_volume.discovery_dell_eql_volume(section)) == result
+    assert list(dell_eql_volume.discovery_dell_eql_volume({}, section, SAMPLE_STATS)) == result
+
+
+DISCOVERY_SECTION = dell_eql_volume.parse_dell_eql_volume([
+    [['1', 'Pool1'], ['2', 'Pool2']],
+    [
+        ['1.1', 'VM-DS-01', 'Datastore', '1', '1024', '1', '1'],
+        ['1.2', 'VDI-0001', 'Clone', '1', '1024', '1', '2'],
+        ['1.3', 'TEMPLATE', 'Template', '2', '1024', '2', '1'],
+    ],
+])
+
+
+@pytest.mark.parametrize('params, result', [
+    ({}, ['VM-DS-01', 'VDI-0001', 'TEMPLATE']),
+    ({'include_name': ['VM-', 'TEMP']}, ['VM-DS-01', 'TEMPLATE']),
+    ({'exclude_name': ['VDI-']}, ['VM-DS-01', 'TEMPLATE']),
+    ({'include_desc': ['Data'], 'exclude_desc': ['Clone']}, ['VM-DS-01']),
+    ({'include_pool': ['Pool1'], 'exclude_name': ['TEMP']}, ['VM-DS-01']),
+    ({'exclude_pool': ['Pool1']}, ['VDI-0001']),
+    ({'admin_status': [1]}, ['VM-DS-01', 'VDI-0001']),
+    ({'access_type': [2]}, ['TEMPLATE']),
+    ({'include_name': []}, ['VM-DS-01', 'VDI-0001', 'TEMPLATE']),
+])
+def test_discovery_dell_eql_volume_filter(params, result):
+    services = dell_eql_volume.discovery_dell_eql_volume(params, DISCOVERY_SECTION, None)
+    assert [service.item for service in services] == result
 
 
 @pytest.mark.parametrize('item, params, section, result', [
     ('', {}, {}, []),
     (
         'foo', {},
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='',
                 status=1,
                 access=1,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ],
+        },
         []
     ),
     (
         'SAN-LUN0', {'adminStatus': 1, 'accessType': 1},
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='',
                 status=1,
                 access=1,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ],
+        },
         [
             Result(state=State.OK, summary='Status: on-line'),
             Result(state=State.OK, summary='Access: read-write'),
@@ -155,22 +235,17 @@ def test_discovery_dell_eql_volume(section, result):
     ),
     (
         'SAN-LUN0', {'adminStatus': 1, 'accessType': 1},
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='',
                 status=2,
                 access=2,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ],
+        },
         [
             Result(state=State.WARN, summary='Status: offline (expected: on-line)'),
             Result(state=State.WARN, summary='Access: read-only (expected: read-write)'),
@@ -191,22 +266,17 @@ def test_discovery_dell_eql_volume(section, result):
     ),
     (
         'SAN-LUN0', {'adminStatus': 2, 'accessType': 2},
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='',
                 status=2,
                 access=2,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ],
+        },
         [
             Result(state=State.OK, summary='Status: offline'),
             Result(state=State.OK, summary='Access: read-only'),
@@ -227,22 +297,17 @@ def test_discovery_dell_eql_volume(section, result):
     ),
     (
         'SAN-LUN0', {'adminStatus': 1, 'accessType': 1, 'read_iop': (5, 20)},
-        [
-            dell_eql_volume.EqlVolume(
+        {
+            'SAN-LUN0': dell_eql_volume.EqlVolume(
+                index='1.2',
                 name='SAN-LUN0',
                 desc='FooBar',
                 status=1,
                 access=1,
                 size=1073741824000,
                 pool='Member1',
-                write_ios=50,
-                read_ios=60,
-                write_throughput=10,
-                read_throughput=20,
-                write_latency=30,
-                read_latency=40
             )
-        ],
+        },
         [
             Result(state=State.OK, summary='Status: on-line'),
             Result(state=State.OK, summary='Access: read-write'),
@@ -263,10 +328,30 @@ def test_discovery_dell_eql_volume(section, result):
         ]
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_volume(monkeypatch, item, params, section, result):
-    monkeypatch.setattr(dell_eql_volume, 'get_rate', get_rate)
+    monkeypatch.setattr(dell_eql_volume, 'get_rates', get_rates)
     monkeypatch.setattr(dell_eql_volume, 'get_value_store', get_value_store)
-    assert list(dell_eql_volume.check_dell_eql_volume(item, params, section)) == result
+    assert list(dell_eql_volume.check_dell_eql_volume(item, params, section, SAMPLE_STATS)) == result
+
+
+def test_check_dell_eql_volume_wo_stats():
+    section = {
+        'SAN-LUN0': dell_eql_volume.EqlVolume(
+            index='1.2',
+            name='SAN-LUN0',
+            desc='',
+            status=1,
+            access=1,
+            size=1073741824000,
+            pool='Member1',
+        )
+    }
+    assert list(dell_eql_volume.check_dell_eql_volume('SAN-LUN0', {'adminStatus': 1, 'accessType': 1}, section, None)) == [
+        Result(state=State.OK, summary='Status: on-line'),
+        Result(state=State.OK, summary='Access: read-write'),
+        Result(state=State.OK, summary='Pool: Member1'),
+    ]
 
 
 @pytest.mark.parametrize('params, result', [
@@ -343,23 +428,121 @@ def test_check_dell_eql_volume(monkeypatch, item, params, section, result):
         Result(state=State.CRIT, notice='Write latency: 30 seconds (warn/crit at 10 seconds/20 seconds)'),
     ),
 ])
+@pytest.mark.checkmk
 def test_check_dell_eql_volume_w_param(monkeypatch, params, result):
-    monkeypatch.setattr(dell_eql_volume, 'get_rate', get_rate)
+    monkeypatch.setattr(dell_eql_volume, 'get_rates', get_rates)
     monkeypatch.setattr(dell_eql_volume, 'get_value_store', get_value_store)
     params.update({'adminStatus': 2, 'accessType': 2})
-    assert result in list(dell_eql_volume.check_dell_eql_volume('SAN-LUN0', params, [
-        dell_eql_volume.EqlVolume(
+    assert result in list(dell_eql_volume.check_dell_eql_volume('SAN-LUN0', params, {
+        'SAN-LUN0': dell_eql_volume.EqlVolume(
+            index='1.2',
             name='SAN-LUN0',
             desc='',
             status=1,
             access=1,
             size=1073741824000,
             pool='Member1',
-            write_ios=50,
-            read_ios=60,
-            write_throughput=10,
-            read_throughput=20,
-            write_latency=30,
-            read_latency=40
         )
-    ]))
+    }, SAMPLE_STATS))
+
+
+def test_dell_eql_volume_section_names():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.2', 'LUN1', '', '1', '1024', '1', '1'],
+        ],
+    ])
+    assert section.names({'1.2', '1.3'}) == {'1.2': 'LUN1'}
+
+
+def test_dell_eql_volume_stats_section_sums():
+    section = dell_eql_volume.parse_dell_eql_volume_stats([
+        ['1.2', '10', '20', '30', '40', '50', '60'],
+        ['1.3', '1', '2', '3', '4', '5', '6'],
+    ])
+    assert list(section.sums('read_ios', 'write_ios')) == [('1.2', 110), ('1.3', 11)]
+
+
+def test_dell_eql_volume_stats_section_total():
+    section = dell_eql_volume.parse_dell_eql_volume_stats([
+        ['1.2', '10', '20', '30', '40', '50', '60'],
+        ['1.3', '1', '2', '3', '4', '5', '6'],
+    ])
+    assert section.total(['1.2', '1.3', '1.4']) == dell_eql_volume.EqlVolumeStats(
+        write_ios=55,
+        read_ios=66,
+        write_throughput=11,
+        read_throughput=22,
+        write_latency=33,
+        read_latency=44,
+    )
+    assert section.total(['1.4']) is None
+
+
+def test_dell_eql_volume_section_pool_indexes():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.2', 'BROKEN', '', 'x', '', '1', '1'],
+            ['1.3', 'LUN2', '', '1', '1024', '1', '2'],
+        ],
+    ])
+    assert section.pool_indexes() == {'Pool1': ['1.1', '1.2'], '2': ['1.3']}
+
+
+@pytest.mark.parametrize('rates, result', [
+    (None, {}),
+    # Two volumes with 2 and 8 ms per read operation
+    (dell_eql_volume.EqlVolumeStats(
+        write_ios=0, read_ios=5, write_throughput=0, read_throughput=100, write_latency=0, read_latency=2 * 1 + 8 * 4,
+    ), {
+        'write_ios': 0, 'read_ios': 5, 'write_throughput': 0, 'read_throughput': 100, 'read_latency': 34 / 5 * 0.001,
+    }),
+])
+def test_summed_disk(rates, result):
+    assert dell_eql_volume.summed_disk(rates) == result
+
+
+def test_dell_eql_volume_section_unknown_pool():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [['1.1', 'LUN0', '', '1', '1024', '1', '2']],
+    ])
+    assert section.get('LUN0').pool == '2'
+
+
+def test_check_dell_eql_volume_drops_legacy_rates(monkeypatch):
+    value_store = {f'check_dell_eql_volume.SAN-LUN0.{key}': (100, 10) for key in dell_eql_volume.EqlVolumeStats._fields}
+    value_store['check_dell_eql_volume.OTHER.read_ios'] = (100, 10)
+    monkeypatch.setattr(dell_eql_volume, 'get_value_store', lambda: value_store)
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Member1']],
+        [['1.2', 'SAN-LUN0', '', '1', '1024', '1', '1']],
+    ])
+    list(dell_eql_volume.check_dell_eql_volume('SAN-LUN0', {'adminStatus': 1, 'accessType': 1}, section, SAMPLE_STATS))
+    assert sorted(value_store) == ['check_dell_eql_volume.OTHER.read_ios', 'dell_eql_volume']
+
+
+def test_dell_eql_volume_section_fingerprint():
+    section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.2', 'LUN1', '', '1', '1024', '1', '1'],
+        ],
+    ])
+    assert list(section.name_indexes()) == [('LUN0', '1.1'), ('LUN1', '1.2')]
+    assert section.fingerprint() is section.fingerprint()
+    assert section.fingerprint()[0] == 2
+
+    recreated = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+            ['1.3', 'LUN1', '', '1', '1024', '1', '1'],
+        ],
+    ])
+    assert recreated.fingerprint() != section.fingerprint()
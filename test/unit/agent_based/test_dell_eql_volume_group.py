@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    render,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_volume, dell_eql_volume_group
+
+
+def get_total_rates(_value_store, _key, _time, counters, _members):
+    return counters
+
+
+def get_value_store():
+    return {}
+
+
+SECTION = dell_eql_volume.parse_dell_eql_volume([
+    [['1', 'Pool1']],
+    [
+        ['1.1', 'VM-DS-01', '', '1', '1024', '1', '1'],
+        ['1.2', 'VM-DS-02', '', '1', '1024', '1', '1'],
+        ['1.3', 'SQL-01', '', '1', '1024', '1', '1'],
+    ],
+])
+
+SECTION_STATS = dell_eql_volume.parse_dell_eql_volume_stats([
+    ['1.1', '10', '20', '30', '40', '50', '60'],
+    ['1.2', '1', '2', '3', '4', '5', '6'],
+    ['1.3', '100', '100', '100', '100', '100', '100'],
+])
+
+
+@pytest.mark.parametrize('patterns, result', [
+    (['VM-DS-'], ['1.1', '1.2']),
+    (['SQL-', 'VM-DS-02'], ['1.2', '1.3']),
+    (['DS-'], []),
+])
+def test_group_volumes(patterns, result):
+    assert sorted(dell_eql_volume_group.group_volumes(SECTION, patterns)) == result
+
+
+def test_group_volumes_cached(monkeypatch):
+    compiled = []
+    real_compile = dell_eql_volume_group.re.compile
+
+    def compile(pattern):
+        compiled.append(pattern)
+        return real_compile(pattern)
+
+    monkeypatch.setattr(dell_eql_volume_group, 're', type('re', (), {'compile': staticmethod(compile)}))
+    value_store = {}
+    for _cycle in range(3):
+        # Every cycle parses the section again
+        section = dell_eql_volume.parse_dell_eql_volume([
+            [['1', 'Pool1']],
+            [['1.1', 'VM-DS-01', '', '1', '1024', '1', '1'], ['1.3', 'SQL-01', '', '1', '1024', '1', '1']],
+        ])
+        assert dell_eql_volume_group.group_volumes(section, ['VM-'], value_store) == ['1.1']
+    assert len(compiled) == 1
+
+    assert dell_eql_volume_group.group_volumes(SECTION, ['VM-'], value_store) == ['1.1', '1.2']
+    assert dell_eql_volume_group.group_volumes(SECTION, ['SQL-'], value_store) == ['1.3']
+    assert dell_eql_volume_group.group_volumes(SECTION, ['SQL-']) == ['1.3']
+    assert len(compiled) == 4
+
+
+def test_group_volumes_recreated():
+    value_store = {}
+    assert dell_eql_volume_group.group_volumes(SECTION, ['SQL-'], value_store) == ['1.3']
+    recreated = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'VM-DS-01', '', '1', '1024', '1', '1'],
+            ['1.2', 'VM-DS-02', '', '1', '1024', '1', '1'],
+            ['1.5', 'SQL-01', '', '1', '1024', '1', '1'],
+        ],
+    ])
+    assert dell_eql_volume_group.group_volumes(recreated, ['SQL-'], value_store) == ['1.5']
+
+
+@pytest.mark.checkmk
+def test_check_dell_eql_volume_group_volume_joins(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(dell_eql_volume_group, 'get_value_store', lambda: value_store)
+    joined_section = dell_eql_volume.parse_dell_eql_volume([
+        [['1', 'Pool1']],
+        [
+            ['1.1', 'VM-DS-01', '', '1', '1024', '1', '1'],
+            ['1.2', 'VM-DS-02', '', '1', '1024', '1', '1'],
+            ['1.4', 'VM-DS-03', '', '1', '1024', '1', '1'],
+        ],
+    ])
+    joined_stats = dell_eql_volume.parse_dell_eql_volume_stats([
+        ['1.1', '10', '20', '30', '40', '50', '60'],
+        ['1.2', '1', '2', '3', '4', '5', '6'],
+        ['1.4', '6000000000000', '0', '0', '0', '0', '0'],
+    ])
+    params = {'patterns': ['VM-DS-']}
+
+    for now, section, stats in [(0, SECTION, SECTION_STATS), (60, joined_section, joined_stats)]:
+        monkeypatch.setattr(dell_eql_volume_group.time, 'time', lambda: now)
+        assert list(dell_eql_volume_group.check_dell_eql_volume_group('VM', params, section, stats))[1:] == []
+
+    monkeypatch.setattr(dell_eql_volume_group.time, 'time', lambda: 120)
+    results = list(dell_eql_volume_group.check_dell_eql_volume_group('VM', params, joined_section, joined_stats))
+    assert Metric('disk_write_throughput', 0.0) in results
+
+
+def test_discovery_dell_eql_volume_group():
+    params = [
+        {'groups': [('VM', ['VM-DS-']), ('VDI', ['VDI-'])]},
+        {'groups': [('VM', ['VM-']), ('SQL', ['SQL-'])]},
+    ]
+    assert list(dell_eql_volume_group.discovery_dell_eql_volume_group(params, SECTION, SECTION_STATS)) == [
+        Service(item='VM', parameters={'patterns': ['VM-DS-']}),
+        Service(item='SQL', parameters={'patterns': ['SQL-']}),
+    ]
+    assert list(dell_eql_volume_group.discovery_dell_eql_volume_group([{}], SECTION, SECTION_STATS)) == []
+
+
+@pytest.mark.parametrize('params, result', [
+    ({}, []),
+    ({'patterns': ['DS-']}, [Result(state=State.OK, summary='Volumes: 0')]),
+    ({'patterns': ['VM-DS-']}, [
+        Result(state=State.OK, summary='Volumes: 2'),
+        Result(state=State.OK, summary='Read: 22.0 B/s'),
+        Metric('disk_read_throughput', 22.0),
+        Result(state=State.OK, summary='Write: 11.0 B/s'),
+        Metric('disk_write_throughput', 11.0),
+        Result(state=State.OK, notice='Read operations: 66.00/s'),
+        Metric('disk_read_ios', 66.0),
+        Result(state=State.OK, notice='Write operations: 55.00/s'),
+        Metric('disk_write_ios', 55.0),
+        Result(state=State.OK, notice=f'Read latency: {render.timespan(44 / 66 * 0.001)}'),
+        Metric('disk_read_latency', 44 / 66 * 0.001),
+        Result(state=State.OK, notice=f'Write latency: {render.timespan(33 / 55 * 0.001)}'),
+        Metric('disk_write_latency', 33 / 55 * 0.001),
+    ]),
+])
+@pytest.mark.checkmk
+def test_check_dell_eql_volume_group(monkeypatch, params, result):
+    monkeypatch.setattr(dell_eql_volume_group, 'get_total_rates', get_total_rates)
+    monkeypatch.setattr(dell_eql_volume_group, 'get_value_store', get_value_store)
+    assert list(dell_eql_volume_group.check_dell_eql_volume_group('VM', params, SECTION, SECTION_STATS)) == result
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import pytest  # type: ignore[import]
+from cmk.base.plugins.agent_based.agent_based_api.v1 import (
+    Metric,
+    render,
+    Result,
+    Service,
+    State,
+)
+from cmk.base.plugins.agent_based import dell_eql_volume, dell_eql_volume_top
+
+
+SECTION = dell_eql_volume.parse_dell_eql_volume([
+    [['1', 'Pool1']],
+    [
+        ['1.1', 'LUN0', '', '1', '1024', '1', '1'],
+        ['1.2', 'LUN1', '', '1', '1024', '1', '1'],
+        ['1.3', 'LUN2', '', '1', '1024', '1', '1'],
+    ],
+])
+
+# write/read throughput, write/read latency, write/read ios
+LAST_STATS = dell_eql_volume.parse_dell_eql_volume_stats([
+    ['1.1', '0', '0', '0', '0', '0', '0'],
+    ['1.2', '0', '0', '0', '0', '0', '0'],
+    ['1.3', '0', '0', '0', '0', '0', '0'],
+])
+
+STATS = dell_eql_volume.parse_dell_eql_volume_stats([
+    ['1.1', '100', '100', '1000', '1000', '10', '10'],
+    ['1.2', '600', '600', '200', '200', '100', '100'],
+    ['1.3', '300', '300', '4000', '4000', '0', '0'],
+])
+
+
+@pytest.fixture
+def value_store(monkeypatch):
+    store = {}
+    monkeypatch.setattr(dell_eql_volume_top, 'get_value_store', lambda: store)
+    return store
+
+
+def check(params, value_store, monkeypatch):
+    monkeypatch.setattr(dell_eql_volume_top.time, 'time', lambda: 100.0)
+    list(dell_eql_volume_top.check_dell_eql_volume_top(params, SECTION, LAST_STATS))
+    monkeypatch.setattr(dell_eql_volume_top.time, 'time', lambda: 110.0)
+    return list(dell_eql_volume_top.check_dell_eql_volume_top(params, SECTION, STATS))
+
+
+def test_discovery_dell_eql_volume_top():
+    assert list(dell_eql_volume_top.discovery_dell_eql_volume_top(SECTION, STATS)) == [Service()]
+    assert list(dell_eql_volume_top.discovery_dell_eql_volume_top(SECTION, None)) == []
+
+
+def test_check_dell_eql_volume_top_first_cycle(value_store):
+    assert list(dell_eql_volume_top.check_dell_eql_volume_top({'count': 2, 'rank_by': 'ios'}, SECTION, STATS)) == [
+        Result(state=State.OK, summary='Volumes: 3'),
+    ]
+    assert value_store['dell_eql_volume_top'][2] == {'1.1': 20, '1.2': 200, '1.3': 0}
+
+
+@pytest.mark.parametrize('params, result', [
+    ({'count': 2, 'rank_by': 'ios'}, [
+        Result(state=State.OK, summary='Volumes: 3'),
+        Result(state=State.OK, summary='Operations #1 LUN1: 20.00/s'),
+        Metric('dell_eql_volume_top_ios_1', 20.0),
+        Result(state=State.OK, notice='Operations #2 LUN0: 2.00/s'),
+        Metric('dell_eql_volume_top_ios_2', 2.0),
+    ]),
+    ({'count': 1, 'rank_by': 'throughput', 'levels': (100.0, 200.0)}, [
+        Result(state=State.OK, summary='Volumes: 3'),
+        Result(state=State.WARN, summary=f'Throughput #1 LUN1: {render.iobandwidth(120.0)} '
+                                         f'(warn/crit at {render.iobandwidth(100.0)}/{render.iobandwidth(200.0)})'),
+        Metric('dell_eql_volume_top_throughput_1', 120.0, levels=(100.0, 200.0)),
+    ]),
+    ({'count': 5, 'rank_by': 'latency'}, [
+        Result(state=State.OK, summary='Volumes: 3'),
+        Result(state=State.OK, summary=f'Latency #1 LUN0: {render.timespan(0.1)}'),
+        Metric('dell_eql_volume_top_latency_1', 0.1),
+        Result(state=State.OK, notice=f'Latency #2 LUN1: {render.timespan(0.002)}'),
+        Metric('dell_eql_volume_top_latency_2', 0.002),
+    ]),
+])
+@pytest.mark.checkmk
+def test_check_dell_eql_volume_top(monkeypatch, value_store, params, result):
+    assert check(params, value_store, monkeypatch) == result
+
+
+def test_check_dell_eql_volume_top_reset(monkeypatch, value_store):
+    monkeypatch.setattr(dell_eql_volume_top.time, 'time', lambda: 100.0)
+    list(dell_eql_volume_top.check_dell_eql_volume_top({'count': 2, 'rank_by': 'throughput'}, SECTION, STATS))
+    monkeypatch.setattr(dell_eql_volume_top.time, 'time', lambda: 110.0)
+    assert list(dell_eql_volume_top.check_dell_eql_volume_top({'count': 2, 'rank_by': 'throughput'}, SECTION, LAST_STATS)) == [
+        Result(state=State.OK, summary='Volumes: 3'),
+    ]
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+
+import asyncio
+import bisect
+import contextlib
+import importlib.machinery
+import importlib.util
+import threading
+from pathlib import Path
+import pytest  # type: ignore[import]
+
+AGENT = Path(__file__).resolve().parents[3] / 'agents' / 'special' / 'agent_dell_eql'
+
+loader = importlib.machinery.SourceFileLoader('agent_dell_eql', str(AGENT))
+agent_dell_eql = importlib.util.module_from_spec(importlib.util.spec_from_loader(loader.name, loader))
+loader.exec_module(agent_dell_eql)
+
+
+class SnmpResponder(asyncio.DatagramProtocol):
+    """SNMPv2c agent answering GETBULK requests from a walk
+
+    `latency` is called with the number of the request and returns the
+    seconds to delay the response or None to drop the request. Requests
+    below one of the `dropped` OIDs are never answered.
+    """
+
+    def __init__(self, walk, community='public', latency=None, dropped=()):
+        self.oids = sorted(agent_dell_eql.oid_from_str(oid) for oid in walk)
+        self.values = {agent_dell_eql.oid_from_str(oid): value for oid, value in walk.items()}
+        self.community = community
+        self.latency = latency or (lambda request: 0)
+        self.dropped = [agent_dell_eql.oid_from_str(oid) for oid in dropped]
+        self.requests = 0
+        self.requested = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        community, _, request_id, _, max_repetitions, varbinds = agent_dell_eql.decode_message(data)
+        if community != self.community:
+            return
+        self.requests += 1
+        self.requested.append(varbinds[0][0])
+        delay = self.latency(self.requests)
+        if delay is None or any(varbinds[0][0][:len(oid)] == oid for oid in self.dropped):
+            return
+        start = bisect.bisect_right(self.oids, varbinds[0][0])
+        response = [(oid, self.values[oid]) for oid in self.oids[start:start + max_repetitions]]
+        if len(response) < max_repetitions:
+            last = response[-1][0] if response else varbinds[0][0]
+            response.append((last, agent_dell_eql.SnmpException(agent_dell_eql.END_OF_MIB_VIEW)))
+        message = agent_dell_eql.encode_message(community, agent_dell_eql.GET_RESPONSE, request_id, 0, 0, response)
+        asyncio.get_running_loop().call_later(delay, self.transport.sendto, message, addr)
+
+
+async def collect(walk, community='public', sections=None, pacing=None, timeout=1.0, cache=None, latency=None, stats=None, dropped=()):
+    """Run the agent against a local responder, returns the sections, errors and the responder"""
+    loop = asyncio.get_running_loop()
+    transport, responder = await loop.create_datagram_endpoint(
+        lambda: SnmpResponder(walk, latency=latency, dropped=dropped),
+        local_addr=('127.0.0.1', 0),
+    )
+    _, client = await loop.create_datagram_endpoint(
+        lambda: agent_dell_eql.SnmpClient(community, timeout, 0),
+        remote_addr=transport.get_extra_info('sockname'),
+    )
+    try:
+        sections, errors = await agent_dell_eql.collect_sections(
+            client,
+            sections or list(agent_dell_eql.SECTIONS),
+            pacing or agent_dell_eql.Pacing(3),
+            4,
+            cache,
+            stats,
+        )
+        return sections, errors, responder
+    finally:
+        client.close()
+        transport.close()
+
+
+@contextlib.contextmanager
+def serve(walk, dropped=()):
+    """Run a local responder in a thread for calls of main(), yields its port"""
+    loop = asyncio.new_event_loop()
+    transport, _ = loop.run_until_complete(loop.create_datagram_endpoint(
+        lambda: SnmpResponder(walk, dropped=dropped),
+        local_addr=('127.0.0.1', 0),
+    ))
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        yield transport.get_extra_info('sockname')[1]
+    finally:
+        loop.call_soon_threadsafe(transport.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+WALK = {
+    '.1.3.6.1.4.1.12740.2.1.1.1.9.1.1234567890': b'MEMBER1',
+    '.1.3.6.1.4.1.12740.2.1.1.1.9.1.1234567891': b'MEMBER2',
+    '.1.3.6.1.4.1.12740.2.1.1.1.7.1.1234567890': b'Shelf\t1',
+    '.1.3.6.1.4.1.12740.2.1.5.1.2.1.1234567890': b'\x00\x00\x00\x01',
+    '.1.3.6.1.4.1.12740.3.1.1.1.8.1.1234567890.6': 1,
+    '.1.3.6.1.4.1.12740.3.1.1.1.11.1.1234567890.6': 5,
+    '.1.3.6.1.4.1.12740.3.1.1.1.17.1.1234567890.6': 1,
+    '.1.3.6.1.4.1.12740.3.1.1.1.8.1.1234567890.10': 3,
+    '.1.3.6.1.4.1.12740.3.1.1.1.11.1.1234567890.10': 9,
+    '.1.3.6.1.4.1.12740.3.1.1.1.17.1.1234567890.10': 2,
+    '.1.3.6.1.4.1.12740.3.1.2.1.2.1.1234567890.6': 56830743714816,
+    '.1.3.6.1.4.1.12740.16.1.1.1.3.1.1': b'default',
+    '.1.3.6.1.4.1.12740.5.1.7.1.1.4.1234567890.47': b'VM-Test01',
+    '.1.3.6.1.4.1.12740.5.1.7.1.1.22.1234567890.47': 1,
+}
+
+
+@pytest.mark.parametrize('varbinds', [
+    [],
+    [((1, 3, 6, 1, 4, 1, 12740, 2, 1, 1, 1, 9, 1, 1715262484), None)],
+    [((1, 3, 6), -129), ((1, 3, 7), 2 ** 63), ((1, 3, 8), b'x' * 300)],
+    [((1, 3, 6), agent_dell_eql.SnmpException(agent_dell_eql.END_OF_MIB_VIEW))],
+])
+def test_message_roundtrip(varbinds):
+    message = agent_dell_eql.encode_message('public', agent_dell_eql.GET_BULK_REQUEST, 4711, 0, 25, varbinds)
+    assert agent_dell_eql.decode_message(message) == ('public', agent_dell_eql.GET_BULK_REQUEST, 4711, 0, 25, varbinds)
+
+
+@pytest.mark.parametrize('message', [
+    b'',
+    b'\x30\x05\x02\x01\x01',
+    b'\x04\x00',
+    # A varbind with an OID but no value
+    agent_dell_eql._encode(agent_dell_eql.SEQUENCE, b''.join([
+        agent_dell_eql._encode_integer(agent_dell_eql.SNMP_VERSION_2C),
+        agent_dell_eql._encode(agent_dell_eql.OCTET_STRING, b'public'),
+        agent_dell_eql._encode(agent_dell_eql.GET_RESPONSE, b''.join([
+            agent_dell_eql._encode_integer(4711),
+            agent_dell_eql._encode_integer(0),
+            agent_dell_eql._encode_integer(0),
+            agent_dell_eql._encode(agent_dell_eql.SEQUENCE, agent_dell_eql._encode(
+                agent_dell_eql.SEQUENCE, agent_dell_eql._encode_oid((1, 3, 6)),
+            )),
+        ])),
+    ])),
+])
+def test_decode_message_malformed(message):
+    with pytest.raises(agent_dell_eql.SnmpError):
+        agent_dell_eql.decode_message(message)
+
+
+def test_collect_sections():
+    sections, errors, _ = asyncio.run(collect(WALK))
+    assert errors == {}
+    assert sections == {
+        'dell_eql_bulk_member': [
+            ['MEMBER1', 'Shelf 1', '', '00 00 00 01', '', '', '', '', '', ''],
+            ['MEMBER2', '', '', '', '', '', '', '', '', ''],
+        ],
+        'dell_eql_bulk_member_name': [
+            ['1.1234567890', 'MEMBER1'],
+            ['1.1234567891', 'MEMBER2'],
+        ],
+        'dell_eql_bulk_disk': [
+            ['1.1234567890.6', '1', '5', '1'],
+            ['1.1234567890.10', '3', '9', '2'],
+        ],
+        'dell_eql_bulk_disk_stats': [
+            ['1.1234567890.6', '56830743714816', ''],
+        ],
+        'dell_eql_bulk_environment': [],
+        'dell_eql_bulk_volume': [
+            ['0', '1', 'default'],
+            ['1', '1234567890.47', 'VM-Test01', '', '', '', '', '1'],
+        ],
+        'dell_eql_bulk_volume_stats': [],
+    }
+
+
+def test_collect_sections_timeout():
+    pacing = agent_dell_eql.Pacing(3, resumes=0)
+    sections, errors, _ = asyncio.run(collect(WALK, community='private', sections=['dell_eql_bulk_disk'], pacing=pacing, timeout=0.1))
+    assert sections == {}
+    assert list(errors) == ['dell_eql_bulk_disk']
+    assert isinstance(errors['dell_eql_bulk_disk'], agent_dell_eql.SnmpTimeout)
+
+
+def test_write_sections(capsys):
+    agent_dell_eql.write_sections(agent_dell_eql.sys.stdout, {'dell_eql_bulk_disk': [['1.1234567890.6', '1', '5', '1']]})
+    assert capsys.readouterr().out == '<<<dell_eql_bulk_disk:sep(9)>>>\n1.1234567890.6\t1\t5\t1\n'
+
+
+def test_split_by_member():
+    sections, _, _ = asyncio.run(collect(WALK))
+    group, members = agent_dell_eql.split_by_member(sections)
+    assert sorted(group) == ['dell_eql_bulk_member', 'dell_eql_bulk_volume', 'dell_eql_bulk_volume_stats']
+    assert members == {
+        'MEMBER1': {
+            'dell_eql_bulk_member_name': [['1.1234567890', 'MEMBER1']],
+            'dell_eql_bulk_disk': [
+                ['1.1234567890.6', '1', '5', '1'],
+                ['1.1234567890.10', '3', '9', '2'],
+            ],
+            'dell_eql_bulk_disk_stats': [['1.1234567890.6', '56830743714816', '']],
+            'dell_eql_bulk_environment': [],
+        },
+        'MEMBER2': {
+            'dell_eql_bulk_member_name': [['1.1234567891', 'MEMBER2']],
+            'dell_eql_bulk_disk': [],
+            'dell_eql_bulk_disk_stats': [],
+            'dell_eql_bulk_environment': [],
+        },
+    }
+
+
+def test_split_by_member_environment():
+    group, members = agent_dell_eql.split_by_member({
+        'dell_eql_bulk_member_name': [['1.1234567890', 'MEMBER1']],
+        'dell_eql_bulk_environment': [
+            ['0', '1.1234567890.2', 'Backplane sensor 0', '29', '1', '50', '45', '1', '2'],
+            ['1', '1.1234567890.1', 'Fan 0', '6000', '1', '14000', '13500', '3000', '3500'],
+            ['1', '1.1234567899.1', 'Fan 0', '6000', '1', '14000', '13500', '3000', '3500'],
+        ],
+    })
+    assert group == {}
+    assert members['MEMBER1']['dell_eql_bulk_environment'] == [
+        ['0', '1.1234567890.2', 'Backplane sensor 0', '29', '1', '50', '45', '1', '2'],
+        ['1', '1.1234567890.1', 'Fan 0', '6000', '1', '14000', '13500', '3000', '3500'],
+    ]
+
+
+def test_split_by_member_wo_names():
+    sections = {'dell_eql_bulk_disk': [['1.1234567890.6', '1', '5', '1']]}
+    assert agent_dell_eql.split_by_member(sections) == (sections, {})
+
+
+def test_write_piggyback(capsys):
+    agent_dell_eql.write_piggyback(agent_dell_eql.sys.stdout, {'MEMBER1': {'dell_eql_bulk_member_name': [['1.1234567890', 'MEMBER1']]}})
+    assert capsys.readouterr().out == '<<<<MEMBER1>>>>\n<<<dell_eql_bulk_member_name:sep(9)>>>\n1.1234567890\tMEMBER1\n<<<<>>>>\n'
+
+
+def test_collect_sections_cached(tmp_path):
+    cache_file = str(tmp_path / 'cache' / '127.0.0.1')
+    cache = agent_dell_eql.ColumnCache(cache_file, 3600)
+    sections, _, responder = asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk'], cache=cache))
+    cache.save()
+
+    cache = agent_dell_eql.ColumnCache(cache_file, 3600)
+    assert cache.get('.1.3.6.1.4.1.12740.3.1.1.1.11', agent_dell_eql.time.time()) == {'1.1234567890.6': '5', '1.1234567890.10': '9'}
+
+    cached_sections, _, cached_responder = asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk'], cache=cache))
+    assert cached_sections == sections
+    assert cached_responder.requests < responder.requests
+    assert not cache.changed
+
+
+def test_collect_sections_member_name(tmp_path):
+    walk = dict(WALK, **{
+        '.1.3.6.1.4.1.12740.2.1.1.1.7.1.1234567891': b'Shelf 2',
+        '.1.3.6.1.4.1.12740.2.1.5.1.1.1.1234567890': 1,
+        '.1.3.6.1.4.1.12740.2.1.5.1.1.1.1234567891': 1,
+    })
+    name_column = agent_dell_eql.oid_from_str('.1.3.6.1.4.1.12740.2.1.1.1.9')
+
+    def name_requests(responder):
+        return len([oid for oid in responder.requested if oid[:len(name_column)] == name_column])
+
+    member_name, _, _ = asyncio.run(collect(walk, sections=['dell_eql_bulk_member_name']))
+    _, _, member_responder = asyncio.run(collect(walk, sections=['dell_eql_bulk_member']))
+
+    cache = agent_dell_eql.ColumnCache(str(tmp_path / '127.0.0.1'), 3600)
+    for cycle in range(2):
+        sections, errors, responder = asyncio.run(collect(walk, sections=['dell_eql_bulk_member', 'dell_eql_bulk_member_name'], cache=cache))
+        assert errors == {}
+        assert sections['dell_eql_bulk_member_name'] == member_name['dell_eql_bulk_member_name'] == [
+            ['1.1234567890', 'MEMBER1'],
+            ['1.1234567891', 'MEMBER2'],
+        ]
+        # The names are walked once with the member table, then taken from the cache
+        assert name_requests(responder) == (name_requests(member_responder) if cycle == 0 else 0)
+
+
+def test_collect_sections_member_name_wo_member():
+    pacing = agent_dell_eql.Pacing(3, resumes=0)
+    sections, errors, _ = asyncio.run(collect(
+        WALK,
+        sections=['dell_eql_bulk_member', 'dell_eql_bulk_member_name'],
+        pacing=pacing,
+        timeout=0.05,
+        dropped=['.1.3.6.1.4.1.12740.2.1.5'],
+    ))
+    assert list(errors) == ['dell_eql_bulk_member']
+    assert sections == {'dell_eql_bulk_member_name': [['1.1234567890', 'MEMBER1'], ['1.1234567891', 'MEMBER2']]}
+
+
+def test_collect_sections_cache_invalid(tmp_path):
+    cache_file = str(tmp_path / '127.0.0.1')
+    cache = agent_dell_eql.ColumnCache(cache_file, 3600)
+    asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk'], cache=cache))
+    cache.save()
+
+    walk = dict(WALK, **{
+        '.1.3.6.1.4.1.12740.3.1.1.1.8.1.1234567890.11': 1,
+        '.1.3.6.1.4.1.12740.3.1.1.1.11.1.1234567890.11': 10,
+        '.1.3.6.1.4.1.12740.3.1.1.1.17.1.1234567890.11': 1,
+    })
+    cache = agent_dell_eql.ColumnCache(cache_file, 3600)
+    sections, _, _ = asyncio.run(collect(walk, sections=['dell_eql_bulk_disk'], cache=cache))
+    assert sections['dell_eql_bulk_disk'][-1] == ['1.1234567890.11', '1', '10', '1']
+    assert cache.changed
+
+
+@pytest.mark.parametrize('ttl, age, result', [
+    (3600, 10, {'1': 'a'}),
+    (3600, 3600, None),
+    (0, 0, None),
+])
+def test_column_cache(tmp_path, ttl, age, result):
+    cache = agent_dell_eql.ColumnCache(str(tmp_path / 'host'), ttl)
+    cache.set('.1.3', 1000, {'1': 'a'})
+    cache.save()
+    assert agent_dell_eql.ColumnCache(str(tmp_path / 'host'), ttl).get('.1.3', 1000 + age) == result
+
+
+def test_column_cache_broken(tmp_path):
+    (tmp_path / 'host').write_text('{broken')
+    assert agent_dell_eql.ColumnCache(str(tmp_path / 'host'), 3600).get('.1.3', 0) is None
+
+
+@pytest.mark.parametrize('repetitions, duration, result', [
+    (8, 2.0, 4),
+    (1, 2.0, 1),
+    (8, 0.8, 8),
+    (8, 0.1, 10),
+    (24, 0.1, 25),
+])
+def test_pacing_responded(repetitions, duration, result):
+    pacing = agent_dell_eql.Pacing(25, response_time=1.0)
+    pacing.repetitions = repetitions
+    pacing.responded(duration)
+    assert pacing.repetitions == result
+
+
+@pytest.mark.parametrize('failures, deadline, result', [
+    (1, None, 0.5),
+    (3, None, 2.0),
+    (4, None, None),
+    (1, 0.1, None),
+])
+def test_pacing_timed_out(failures, deadline, result):
+    pacing = agent_dell_eql.Pacing(25, resumes=3, backoff=0.5, deadline=deadline and agent_dell_eql.time.monotonic() + deadline)
+    assert pacing.timed_out(failures) == result
+    assert pacing.repetitions == 12
+
+
+def test_collect_sections_slow():
+    pacing = agent_dell_eql.Pacing(10, response_time=0.01)
+    sections, errors, _ = asyncio.run(collect(WALK, pacing=pacing, latency=lambda request: 0.02))
+    assert errors == {}
+    assert sections == asyncio.run(collect(WALK))[0]
+    assert pacing.repetitions == 1
+
+
+def test_collect_sections_resume():
+    pacing = agent_dell_eql.Pacing(1, backoff=0.01)
+    sections, errors, responder = asyncio.run(collect(
+        WALK,
+        sections=['dell_eql_bulk_disk'],
+        pacing=pacing,
+        timeout=0.05,
+        latency=lambda request: None if request in (4, 5, 6) else 0,
+    ))
+    assert errors == {}
+    assert sections == asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk']))[0]
+    # The walks resumed from their last OID instead of starting over
+    assert len(responder.requested) == len(set(responder.requested)) + 3
+
+
+def test_collect_sections_deadline():
+    pacing = agent_dell_eql.Pacing(3, backoff=0.05, deadline=agent_dell_eql.time.monotonic() + 0.3)
+    started = agent_dell_eql.time.monotonic()
+    sections, errors, _ = asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk'], pacing=pacing, latency=lambda request: None))
+    assert agent_dell_eql.time.monotonic() - started < 0.5
+    assert sections == {}
+    assert isinstance(errors['dell_eql_bulk_disk'], agent_dell_eql.SnmpTimeout)
+
+
+def test_collect_sections_stats():
+    stats = {}
+    _, _, responder = asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk', 'dell_eql_bulk_volume'], stats=stats))
+    assert sorted(stats) == ['disk', 'pool', 'volume']
+    assert stats['disk'].rows == 2
+    assert stats['volume'].rows == 1
+    assert sum(table.requests for table in stats.values()) == responder.requests
+    assert all(table.bytes > 0 and table.duration > 0 and table.error == '' for table in stats.values())
+
+
+def test_collect_sections_stats_timeout():
+    stats = {}
+    pacing = agent_dell_eql.Pacing(3, resumes=1, backoff=0.01)
+    asyncio.run(collect(WALK, sections=['dell_eql_bulk_disk'], pacing=pacing, timeout=0.05, latency=lambda request: None, stats=stats))
+    assert stats['disk'].rows == 0
+    assert stats['disk'].bytes == 0
+    assert stats['disk'].timeouts >= 2
+    assert stats['disk'].error.startswith('Timeout after 1 attempts')
+
+
+def read_sections(output):
+    sections = {}
+    for line in output.splitlines():
+        if line.startswith('<<<'):
+            rows = sections.setdefault(line[3:].split(':')[0], [])
+        else:
+            rows.append(line.split('\t'))
+    return sections
+
+
+@pytest.mark.parametrize('dropped, exit_code, written, failed', [
+    ([], 0, ['dell_eql_bulk_disk', 'dell_eql_bulk_volume', 'dell_eql_collector'], []),
+    # A table which fails does not discard the others
+    (['.1.3.6.1.4.1.12740.5.1.7.1.1'], 0, ['dell_eql_bulk_disk', 'dell_eql_collector'], ['volume']),
+    (['.1.3.6.1.4.1.12740'], 1, ['dell_eql_collector'], ['disk', 'pool', 'volume']),
+])
+def test_main(capsys, dropped, exit_code, written, failed):
+    with serve(WALK, dropped) as port:
+        assert agent_dell_eql.main([
+            '--port', str(port), '--timeout', '0.05', '--retries', '0', '--backoff', '0.01', '--deadline', '0.3',
+            '127.0.0.1', '--sections', 'dell_eql_bulk_disk', 'dell_eql_bulk_volume',
+        ]) == exit_code
+    out, err = capsys.readouterr()
+    sections = read_sections(out)
+    assert sorted(sections) == written
+    assert sorted(row[0] for row in sections['dell_eql_collector'] if row[6]) == failed
+    assert sorted(line.split(':')[0] for line in err.splitlines()) == sorted(
+        name for name in ['dell_eql_bulk_disk', 'dell_eql_bulk_volume'] if name not in written
+    )
+
+
+def test_collector_section():
+    stats = agent_dell_eql.TableStats()
+    stats.duration = 1.23456
+    stats.rows = 20000
+    stats.requests = 800
+    stats.bytes = 1048576
+    stats.error = 'Timeout\tafter'
+    assert agent_dell_eql.collector_section({'volume': stats}) == [
+        ['volume', '1.235', '20000', '800', '1048576', '0', 'Timeout after'],
+    ]
@@ -0,0 +1,98 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.metrics.utils import (
+    graph_info,
+    metric_info,
+)
+
+metric_info['dell_eql_collector_duration'] = {
+    'title': _('Walk duration'),
+    'unit': 's',
+    'color': '#00b0d0',
+}
+
+metric_info['dell_eql_collector_rows'] = {
+    'title': _('Rows'),
+    'unit': 'count',
+    'color': '#60c080',
+}
+
+metric_info['dell_eql_collector_requests'] = {
+    'title': _('Requests'),
+    'unit': 'count',
+    'color': '#4080c0',
+}
+
+metric_info['dell_eql_collector_bytes'] = {
+    'title': _('Received data'),
+    'unit': 'bytes',
+    'color': '#f0a040',
+}
+
+metric_info['dell_eql_collector_timeouts'] = {
+    'title': _('Timed out requests'),
+    'unit': 'count',
+    'color': '#e04040',
+}
+
+graph_info['dell_eql_collector_requests'] = {
+    'title': _('Requests'),
+    'metrics': [
+        ('dell_eql_collector_requests', 'area'),
+        ('dell_eql_collector_timeouts', 'line'),
+    ],
+}
+
+metric_info['dell_eql_check_time'] = {
+    'title': _('Check function duration'),
+    'unit': 's',
+    'color': '#a060e0',
+}
+
+metric_info['dell_eql_parse_time'] = {
+    'title': _('Parse function duration'),
+    'unit': 's',
+    'color': '#e060a0',
+}
+
+metric_info['dell_eql_parse_objects'] = {
+    'title': _('Parsed objects'),
+    'unit': 'count',
+    'color': '#e0a080',
+}
+
+for rank in range(1, 51):
+    metric_info[f'dell_eql_volume_top_ios_{rank}'] = {
+        'title': _('Operations of volume #%d') % rank,
+        'unit': '1/s',
+        'color': '#4080c0',
+    }
+    metric_info[f'dell_eql_volume_top_throughput_{rank}'] = {
+        'title': _('Throughput of volume #%d') % rank,
+        'unit': 'bytes/s',
+        'color': '#60c080',
+    }
+    metric_info[f'dell_eql_volume_top_latency_{rank}'] = {
+        'title': _('Latency of volume #%d') % rank,
+        'unit': 's',
+        'color': '#f0a040',
+    }
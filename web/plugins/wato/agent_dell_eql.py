@@ -0,0 +1,132 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.special_agents.common import (
+    RulespecGroupDatasourceProgramsHardware,
+)
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    IndividualOrStoredPassword,
+    rulespec_registry,
+)
+from cmk.gui.valuespec import (
+    Age,
+    Dictionary,
+    FixedValue,
+    Float,
+    Integer,
+)
+
+
+def _valuespec_special_agents_dell_eql():
+    return Dictionary(
+        title=_('Dell EqualLogic via bulk SNMP'),
+        help=_('Collects the member, disk, sensor, volume and pool tables of a Dell EqualLogic '
+               'group with concurrent SNMPv2c GETBULK walks instead of the builtin SNMP fetch. '
+               'Configure the host to use this special agent and no SNMP.'),
+        elements=[
+            ('community', IndividualOrStoredPassword(
+                title=_('SNMP community'),
+                allow_empty=False,
+            )),
+            ('port', Integer(
+                title=_('SNMP port'),
+                default_value=161,
+                minvalue=1,
+                maxvalue=65535,
+            )),
+            ('timeout', Float(
+                title=_('Timeout per request'),
+                unit=_('seconds'),
+                default_value=5.0,
+                minvalue=0.1,
+            )),
+            ('retries', Integer(
+                title=_('Retries per request'),
+                default_value=2,
+                minvalue=0,
+            )),
+            ('max_repetitions', Integer(
+                title=_('Maximal GETBULK max-repetitions'),
+                help=_('Maximal number of rows requested per GETBULK request. The agent reduces '
+                       'the number while the group responds slowly.'),
+                default_value=25,
+                minvalue=1,
+                maxvalue=200,
+            )),
+            ('response_time', Float(
+                title=_('Slow response time'),
+                help=_('Responses taking longer halve the GETBULK max-repetitions.'),
+                unit=_('seconds'),
+                default_value=1.0,
+                minvalue=0.01,
+            )),
+            ('resumes', Integer(
+                title=_('Resumes per walk'),
+                help=_('Times a walk which timed out is resumed from the last OID received '
+                       'before the table is given up.'),
+                default_value=3,
+                minvalue=0,
+            )),
+            ('backoff', Float(
+                title=_('Back-off before resuming a walk'),
+                help=_('Doubled for each further timeout of the same walk.'),
+                unit=_('seconds'),
+                default_value=1.0,
+                minvalue=0.0,
+            )),
+            ('deadline', Age(
+                title=_('Give up walks after'),
+                help=_('Tables not walked completely by then are reported as failed, so the '
+                       'agent finishes within the check interval.'),
+                default_value=50,
+                minvalue=1,
+            )),
+            ('max_concurrency', Integer(
+                title=_('Columns walked in parallel'),
+                default_value=8,
+                minvalue=1,
+            )),
+            ('cache_ttl', Age(
+                title=_('Cache slow changing columns'),
+                help=_('Keeps member and volume names, descriptions, disk slots and pool indexes in a '
+                       'cache file and walks them again only after this time or when the rows of their '
+                       'table changed. Reduces the load on the management CPU of the group.'),
+                default_value=3600,
+                minvalue=60,
+            )),
+            ('piggyback', FixedValue(
+                True,
+                title=_('Piggyback data per member'),
+                totext=_('Disks, fans and temperature sensors are monitored on one host per member'),
+                help=_('Writes the disk, fan and temperature data of each member as piggyback data '
+                       'for a host named like the member. Create these hosts to monitor the services there.'),
+            )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupDatasourceProgramsHardware,
+        name='special_agents:dell_eql',
+        valuespec=_valuespec_special_agents_dell_eql,
+    ))
@@ -0,0 +1,73 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.utils import (
+    CheckParameterRulespecWithItem,
+    rulespec_registry,
+    RulespecGroupCheckParametersStorage,
+)
+from cmk.gui.valuespec import (
+    Dictionary,
+    Filesize,
+    Float,
+    Integer,
+    TextInput,
+    Tuple,
+)
+
+
+def _parameter_valuespec_dell_eql_collector():
+    return Dictionary(
+        elements=[
+            ('duration', Tuple(
+                title=_('Upper levels for the duration of the walk'),
+                elements=[
+                    Float(title=_('Warning at'), unit=_('seconds'), default_value=30.0),
+                    Float(title=_('Critical at'), unit=_('seconds'), default_value=50.0),
+                ],
+            )),
+            ('bytes', Tuple(
+                title=_('Upper levels for the received data'),
+                elements=[
+                    Filesize(title=_('Warning at')),
+                    Filesize(title=_('Critical at')),
+                ],
+            )),
+            ('timeouts', Tuple(
+                title=_('Upper levels for timed out requests'),
+                elements=[
+                    Integer(title=_('Warning at'), default_value=1),
+                    Integer(title=_('Critical at'), default_value=5),
+                ],
+            )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithItem(
+        check_group_name='dell_eql_collector',
+        group=RulespecGroupCheckParametersStorage,
+        item_spec=lambda: TextInput(title=_('Table')),
+        match_type='dict',
+        parameter_valuespec=_parameter_valuespec_dell_eql_collector,
+        title=lambda: _('Dell EqualLogic collector'),
+    ))
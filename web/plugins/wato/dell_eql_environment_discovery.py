@@ -0,0 +1,60 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    rulespec_registry,
+    RulespecGroupCheckParametersDiscovery,
+)
+from cmk.gui.valuespec import (
+    Dictionary,
+    FixedValue,
+)
+
+
+def _valuespec_dell_eql_sensor_discovery(title, sensors):
+    return Dictionary(
+        title=title,
+        elements=[
+            ('summary', FixedValue(
+                True,
+                title=_('Summarize per member'),
+                totext=_('One service per member instead of one per %s') % sensors,
+            )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupCheckParametersDiscovery,
+        match_type='all',
+        name='dell_eql_fan_discovery',
+        valuespec=lambda: _valuespec_dell_eql_sensor_discovery(_('Dell EqualLogic fan discovery'), _('fan')),
+    ))
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupCheckParametersDiscovery,
+        match_type='all',
+        name='dell_eql_temp_discovery',
+        valuespec=lambda: _valuespec_dell_eql_sensor_discovery(_('Dell EqualLogic temperature discovery'), _('sensor')),
+    ))
@@ -0,0 +1,83 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    rulespec_registry,
+    RulespecGroupCheckParametersDiscovery,
+)
+from cmk.gui.valuespec import (
+    Dictionary,
+    ListChoice,
+    ListOfStrings,
+    RegExp,
+)
+
+
+def _patterns(title):
+    return ListOfStrings(
+        title=title,
+        valuespec=RegExp(mode=RegExp.prefix),
+    )
+
+
+def _valuespec_dell_eql_volume_discovery():
+    return Dictionary(
+        title=_('Dell EqualLogic volume discovery'),
+        help=_('Restricts the volumes getting a service. A volume is discovered if it matches one of the '
+               'include patterns of each field set and none of the exclude patterns.'),
+        elements=[
+            ('include_name', _patterns(_('Include volumes with a name matching'))),
+            ('exclude_name', _patterns(_('Exclude volumes with a name matching'))),
+            ('include_desc', _patterns(_('Include volumes with a description matching'))),
+            ('exclude_desc', _patterns(_('Exclude volumes with a description matching'))),
+            ('include_pool', _patterns(_('Include volumes in a pool matching'))),
+            ('exclude_pool', _patterns(_('Exclude volumes in a pool matching'))),
+            ('admin_status', ListChoice(
+                title=_('Include volumes with the admin status'),
+                choices=[
+                    (1, _('on-line')),
+                    (2, _('offline')),
+                    (3, _('online-lost-cached-blocks')),
+                    (4, _('online-control')),
+                    (5, _('offline-control')),
+                ],
+                default_value=[1],
+            )),
+            ('access_type', ListChoice(
+                title=_('Include volumes with the access type'),
+                choices=[
+                    (1, _('read-write')),
+                    (2, _('read-only')),
+                ],
+                default_value=[1, 2],
+            )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupCheckParametersDiscovery,
+        match_type='dict',
+        name='dell_eql_volume_discovery',
+        valuespec=_valuespec_dell_eql_volume_discovery,
+    ))
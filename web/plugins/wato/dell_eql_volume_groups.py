@@ -0,0 +1,68 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    rulespec_registry,
+    RulespecGroupCheckParametersDiscovery,
+)
+from cmk.gui.valuespec import (
+    Dictionary,
+    ListOf,
+    ListOfStrings,
+    RegExp,
+    TextInput,
+    Tuple,
+)
+
+
+def _valuespec_dell_eql_volume_groups():
+    return Dictionary(
+        title=_('Dell EqualLogic volume groups'),
+        help=_('Sums the iops, throughput and latency of all volumes whose name matches one of the '
+               'patterns of a group into one service per group. Groups matching no volume are not '
+               'discovered. If a group is defined in several rules, the first rule wins.'),
+        elements=[
+            ('groups', ListOf(
+                Tuple(
+                    elements=[
+                        TextInput(title=_('Group name'), allow_empty=False),
+                        ListOfStrings(
+                            title=_('Volume name patterns'),
+                            valuespec=RegExp(mode=RegExp.prefix),
+                        ),
+                    ],
+                ),
+                title=_('Volume groups'),
+                add_label=_('Add group'),
+            )),
+        ],
+        optional_keys=[],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupCheckParametersDiscovery,
+        match_type='all',
+        name='dell_eql_volume_groups',
+        valuespec=_valuespec_dell_eql_volume_groups,
+    ))
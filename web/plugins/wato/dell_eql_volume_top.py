@@ -0,0 +1,74 @@
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for Dell EqualLogic Storage System
+#
+# Copyright (C) 2021  Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.wato.utils import (
+    CheckParameterRulespecWithoutItem,
+    rulespec_registry,
+    RulespecGroupCheckParametersStorage,
+)
+from cmk.gui.valuespec import (
+    Dictionary,
+    DropdownChoice,
+    Float,
+    Integer,
+    Tuple,
+)
+
+
+def _parameter_valuespec_dell_eql_volume_top():
+    return Dictionary(
+        elements=[
+            ('count', Integer(
+                title=_('Number of volumes to report'),
+                minvalue=1,
+                maxvalue=50,
+                default_value=10,
+            )),
+            ('rank_by', DropdownChoice(
+                title=_('Rank the volumes by'),
+                choices=[
+                    ('ios', _('Operations per second')),
+                    ('throughput', _('Throughput')),
+                    ('latency', _('Latency per operation')),
+                ],
+                default_value='ios',
+            )),
+            ('levels', Tuple(
+                title=_('Upper levels per reported volume'),
+                help=_('In operations per second, bytes per second or seconds, depending on the ranking.'),
+                elements=[
+                    Float(title=_('Warning at')),
+                    Float(title=_('Critical at')),
+                ],
+            )),
+        ],
+        optional_keys=['levels'],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithoutItem(
+        check_group_name='dell_eql_volume_top',
+        group=RulespecGroupCheckParametersStorage,
+        match_type='dict',
+        parameter_valuespec=_parameter_valuespec_dell_eql_volume_top,
+        title=lambda: _('Dell EqualLogic busiest volumes'),
+    ))